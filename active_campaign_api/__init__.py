@@ -1,7 +1,32 @@
 "Export ActiveCampaignAPI, mock_active_campaign and ActiveCampaign resources"
 
 from .active_campaign_api import ActiveCampaignAPI  # noqa: 401
+from .codec import JSONCodec, OrjsonCodec  # noqa: 401
+from .rate_limit import RateLimiter  # noqa: 401
+from .retry import RetryPolicy, CircuitBreaker  # noqa: 401
+from .instrumentation import (  # noqa: 401
+    RequestEvent,
+    CallCounter,
+    LatencyHistogram,
+    add_observer,
+    remove_observer,
+    record_requests,
+)
+from .async_active_campaign_api import AsyncActiveCampaignAPI  # noqa: 401
+from .client import (  # noqa: 401
+    get_client,
+    set_client,
+    reset_client,
+    use_client,
+    get_async_client,
+    use_async_client,
+)
+from .base_resource import Resource, ResourceView  # noqa: 401
+from .replica import Replica, get_replica, set_replica  # noqa: 401
+from .session import ActiveCampaignSession, SessionResult  # noqa: 401
+from .concurrency import BulkResult  # noqa: 401
 from .resources import (  # noqa: 401
+    BulkImportResult,
     Contact,
     ContactList,
     ContactTag,
@@ -10,3 +35,9 @@ from .resources import (  # noqa: 401
     Tag,
     MarketingList,
 )
+from .incremental_sync import (  # noqa: 401
+    CacheCheckpointStore,
+    ContactChange,
+    FileCheckpointStore,
+    IncrementalContactSync,
+)
@@ -1,11 +1,20 @@
 """Contains ActiceCampaignAPI class"""
 
-import json
+import os
 import urllib
 import typing
+import hashlib
+import tempfile
+import queue
+import threading
+import itertools
+import collections
+import concurrent.futures
 
 from django.conf import settings
 from .base_api import BaseAPI, HttpMethod
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker
 
 
 def require_setting(name: str) -> typing.Any:
@@ -16,6 +25,122 @@ def require_setting(name: str) -> typing.Any:
     return value
 
 
+def build_rate_limiter(root_url: str) -> typing.Optional[RateLimiter]:
+    """Build the rate limiter configured in django settings.
+
+    ActiveCampaign allows 5 requests per second per account. By default the
+    bucket only throttles the threads of this process. With
+    MARKETING_CAMPAIGN_RATE_LIMIT_SHARED, it is kept in a temporary file
+    named after the account url and the user, so every process of the user
+    on the host talking to the same account shares it.
+
+    Args:
+        root_url: The url of the ActiveCampaign account.
+
+    Returns:
+        The rate limiter, or None if MARKETING_CAMPAIGN_RATE_LIMIT is unset.
+    """
+    MARKETING_CAMPAIGN_RATE_LIMIT = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RATE_LIMIT",
+        5,
+    )
+    if not MARKETING_CAMPAIGN_RATE_LIMIT:
+        return None
+
+    MARKETING_CAMPAIGN_RATE_LIMIT_BURST = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RATE_LIMIT_BURST",
+        None,
+    )
+    MARKETING_CAMPAIGN_RATE_LIMIT_FILE = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RATE_LIMIT_FILE",
+        None,
+    )
+    MARKETING_CAMPAIGN_RATE_LIMIT_SHARED = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RATE_LIMIT_SHARED",
+        False,
+    )
+    if MARKETING_CAMPAIGN_RATE_LIMIT_SHARED and not MARKETING_CAMPAIGN_RATE_LIMIT_FILE:
+        account = hashlib.sha1(root_url.encode()).hexdigest()[:16]
+        # The file is only accessible to its owner, so every user gets its own
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        MARKETING_CAMPAIGN_RATE_LIMIT_FILE = os.path.join(
+            tempfile.gettempdir(),
+            f"active-campaign-{account}-{uid}.bucket",
+        )
+
+    return RateLimiter(
+        MARKETING_CAMPAIGN_RATE_LIMIT,
+        burst=MARKETING_CAMPAIGN_RATE_LIMIT_BURST,
+        path=MARKETING_CAMPAIGN_RATE_LIMIT_FILE,
+    )
+
+
+def build_retry_policy() -> typing.Optional[RetryPolicy]:
+    """Build the retry policy configured in django settings.
+
+    Returns:
+        The retry policy, or None if MARKETING_CAMPAIGN_MAX_RETRIES is unset.
+    """
+    MARKETING_CAMPAIGN_MAX_RETRIES = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_MAX_RETRIES",
+        3,
+    )
+    if not MARKETING_CAMPAIGN_MAX_RETRIES:
+        return None
+
+    MARKETING_CAMPAIGN_RETRY_BACKOFF = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RETRY_BACKOFF",
+        0.5,
+    )
+    MARKETING_CAMPAIGN_RETRY_METHODS = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_RETRY_METHODS",
+        None,
+    )
+    return RetryPolicy(
+        max_retries=MARKETING_CAMPAIGN_MAX_RETRIES,
+        backoff_factor=MARKETING_CAMPAIGN_RETRY_BACKOFF,
+        methods=MARKETING_CAMPAIGN_RETRY_METHODS,
+    )
+
+
+def build_circuit_breaker() -> typing.Optional[CircuitBreaker]:
+    """Build the circuit breaker configured in django settings.
+
+    The breaker belongs to the shared client, so it is process-wide: once
+    it opens, every request of the process fails with CircuitOpenError until
+    the timeout elapses. Tests failing requests on purpose should use their
+    own client, as mock_active_campaign does, or call reset_client.
+
+    Returns:
+        The circuit breaker, or None if
+        MARKETING_CAMPAIGN_CIRCUIT_BREAKER_THRESHOLD is unset.
+    """
+    MARKETING_CAMPAIGN_CIRCUIT_BREAKER_THRESHOLD = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_CIRCUIT_BREAKER_THRESHOLD",
+        5,
+    )
+    if not MARKETING_CAMPAIGN_CIRCUIT_BREAKER_THRESHOLD:
+        return None
+
+    MARKETING_CAMPAIGN_CIRCUIT_BREAKER_TIMEOUT = getattr(
+        settings,
+        "MARKETING_CAMPAIGN_CIRCUIT_BREAKER_TIMEOUT",
+        30.0,
+    )
+    return CircuitBreaker(
+        failure_threshold=MARKETING_CAMPAIGN_CIRCUIT_BREAKER_THRESHOLD,
+        recovery_timeout=MARKETING_CAMPAIGN_CIRCUIT_BREAKER_TIMEOUT,
+    )
+
+
 def singular_form(resource_name: str) -> str:
     """Gets the singular form of the resource_name,
     that is, removing the s at the end of it"""
@@ -38,20 +163,49 @@ class ActiveCampaignAPI(BaseAPI):
             None,
         )
 
-        super().__init__(MARKETING_CAMPAIGN_URL, MARKETING_CAMPAIGN_REQUEST_TIMEOUT)
-        self.session.headers.update({"Api-Token": MARKETING_CAMPAIGN_KEY})
+        MARKETING_CAMPAIGN_POOL_CONNECTIONS = getattr(
+            settings,
+            "MARKETING_CAMPAIGN_POOL_CONNECTIONS",
+            10,
+        )
+        MARKETING_CAMPAIGN_POOL_MAXSIZE = getattr(
+            settings,
+            "MARKETING_CAMPAIGN_POOL_MAXSIZE",
+            10,
+        )
+
+        super().__init__(
+            MARKETING_CAMPAIGN_URL,
+            MARKETING_CAMPAIGN_REQUEST_TIMEOUT,
+            pool_connections=MARKETING_CAMPAIGN_POOL_CONNECTIONS,
+            pool_maxsize=MARKETING_CAMPAIGN_POOL_MAXSIZE,
+            rate_limiter=build_rate_limiter(MARKETING_CAMPAIGN_URL),
+            retry_policy=build_retry_policy(),
+            circuit_breaker=build_circuit_breaker(),
+            coalesce_gets=getattr(settings, "MARKETING_CAMPAIGN_COALESCE_GETS", False),
+        )
+        self.headers.update({"Api-Token": MARKETING_CAMPAIGN_KEY})
 
     # A mapping (from name to id) for lists in ActiveCampaign
     LISTS = {
         "SD: Marketing List": 43,
     }
 
+    # limit = 100 is the maximum amount allowed in ActiveCampaign
+    # API v3. If you make a request with limit=1000 as query param,
+    # you will get back only 100 results
+    PAGE_LIMIT = 100
+
     def list_resources(
         self,
         resource_name: str,
         resource_id: typing.Optional[int] = None,
         nested_resource_name: typing.Optional[str] = None,
         query_params: typing.Optional[dict] = None,
+        max_workers: typing.Optional[int] = None,
+        prefetch: int = 0,
+        keyset: bool = False,
+        after_id: typing.Optional[int] = None,
     ) -> typing.Generator[dict, None, None]:
         """List all the recources of the given name.
         If resource_id and nested_resource_name are passed,
@@ -67,48 +221,248 @@ class ActiveCampaignAPI(BaseAPI):
                 The name of the nested resource to fetch
             query_params: typing.Optional[dict]
                 the key value pairs for the query params.
+            max_workers: typing.Optional[int]
+                Fetch the remaining pages concurrently with up to
+                this many threads. Rows are still yielded in order.
+            prefetch: int
+                Fetch up to this many pages in a background thread
+                while the current one is being consumed.
+            keyset: bool
+                Paginate by id instead of offset. Only for top level
+                resources supporting the id_greater filter, such as contacts.
+            after_id: typing.Optional[int]
+                In keyset mode, start after the resource with this id,
+                e.g. the last one seen by an interrupted scan.
 
         Yields:
             A single resource from the server.
         """
-        offset = 0
-        # limit = 100 is the maximum amount allowed in ActiveCampaign
-        # API v3. If you make a request with limit=1000 as query param,
-        # you will get back only 100 results
-        limit = 100
-        total = 0
-        query_params = query_params or {}
-
         resource_key_in_response = resource_name
         if resource_id and nested_resource_name:
             # We want the list of nested_resource_name
             resource_key_in_response = nested_resource_name
 
-        while offset <= total:
-            query_params.update({"limit": limit, "offset": offset})
+        for page in self.list_pages(
+            resource_name,
+            resource_id=resource_id,
+            nested_resource_name=nested_resource_name,
+            query_params=query_params,
+            max_workers=max_workers,
+            prefetch=prefetch,
+            keyset=keyset,
+            after_id=after_id,
+        ):
+            for resource_data in page[resource_key_in_response]:
+                yield resource_data
+
+    def list_pages(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int] = None,
+        nested_resource_name: typing.Optional[str] = None,
+        query_params: typing.Optional[dict] = None,
+        max_workers: typing.Optional[int] = None,
+        prefetch: int = 0,
+        keyset: bool = False,
+        after_id: typing.Optional[int] = None,
+        start_offset: int = 0,
+    ) -> typing.Generator[dict, None, None]:
+        """List the decoded response of every page of the given resource.
+
+        Takes the same arguments as list_resources, and start_offset to
+        skip the rows before it when paginating by offset.
+
+        Yields:
+            The decoded body of a single page, in offset order.
+        """
+        if keyset:
+            if max_workers and max_workers > 1:
+                raise ValueError("Keyset pages can only be fetched one by one")
+            if resource_id is not None or nested_resource_name is not None:
+                raise ValueError("Nested resources cannot be paginated by id")
+            pages = self._iter_keyset_pages(
+                resource_name,
+                dict(query_params or {}),
+                after_id,
+            )
+        else:
+            pages = self._iter_pages(
+                resource_name,
+                resource_id,
+                nested_resource_name,
+                dict(query_params or {}),
+                max_workers,
+                start_offset,
+            )
+        if prefetch > 0:
+            pages = self._read_ahead(pages, prefetch)
+        yield from pages
+
+    def _iter_pages(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int],
+        nested_resource_name: typing.Optional[str],
+        query_params: dict,
+        max_workers: typing.Optional[int],
+        start_offset: int = 0,
+    ) -> typing.Generator[dict, None, None]:
+        """Fetch the pages listed by list_pages, in the calling thread."""
+
+        def fetch_page(offset: int) -> dict:
+            """Get the page starting at the given offset."""
             path = self._prepare_path(
                 resource_name,
                 resource_id=resource_id,
                 nested_resource_name=nested_resource_name,
-                query_params=query_params,
+                query_params={
+                    **query_params,
+                    "limit": self.PAGE_LIMIT,
+                    "offset": offset,
+                },
             )
-
             response = self._send_request(method=HttpMethod.GET, path=path)
             response.raise_for_status()
+            return self._decode(response)
+
+        page = fetch_page(start_offset)
+        yield page
+
+        total = self._page_total(page)
+        if total is None:
+            # On requests of the form 'contacts/:id/contactTag/
+            # there is not 'meta' nor 'total' attributes on the response
+            return
+
+        if max_workers and max_workers > 1:
+            offsets = range(start_offset + self.PAGE_LIMIT, total, self.PAGE_LIMIT)
+            yield from self._fetch_concurrently(fetch_page, offsets, max_workers)
+            return
+
+        offset = start_offset + self.PAGE_LIMIT
+        while offset < total:
+            page = fetch_page(offset)
+            yield page
+            total = self._page_total(page) or total
+            offset += self.PAGE_LIMIT
+
+    def _iter_keyset_pages(
+        self,
+        resource_name: str,
+        query_params: dict,
+        after_id: typing.Optional[int],
+    ) -> typing.Generator[dict, None, None]:
+        """Fetch pages ordered by id, each continuing after the last id seen.
 
-            for resource_data in response.json()[resource_key_in_response]:
-                yield resource_data
+        Unlike offsets, this costs the same for every page on the server,
+        and rows added or removed during the scan do not shift the pages.
+        """
+        while True:
+            params = {
+                **query_params,
+                "limit": self.PAGE_LIMIT,
+                "orders[id]": "ASC",
+            }
+            if after_id is not None:
+                params["id_greater"] = after_id
+
+            response = self._send_request(
+                method=HttpMethod.GET,
+                path=self._prepare_path(resource_name, query_params=params),
+            )
+            response.raise_for_status()
+            page = self._decode(response)
+            yield page
 
-            # In here we are getting the actual total of results
-            # Not too clean because we are getting the same value
-            # over and over again, but we haven't found a cleaner way
-            try:
-                total = int(response.json()["meta"]["total"])
-                offset += limit
-            except KeyError:
-                # On requests of the form 'contacts/:id/contactTag/
-                # there is not 'meta' nor 'total' attributes on the response
+            rows = page[resource_name]
+            if len(rows) < self.PAGE_LIMIT:
                 return
+            after_id = rows[-1]["id"]
+
+    @staticmethod
+    def _read_ahead(
+        pages: typing.Iterator[dict],
+        depth: int,
+    ) -> typing.Generator[dict, None, None]:
+        """Consume pages in a background thread, at most depth ahead.
+
+        The network and the consumer then work at the same time, while
+        memory stays bounded to depth pages.
+        """
+        buffer: queue.Queue = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: tuple) -> bool:
+            """Wait for room in the buffer, unless the consumer stopped."""
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            """Fetch every page into the buffer."""
+            try:
+                for page in pages:
+                    if not put((page, None)):
+                        return
+                put((done, None))
+            except BaseException as error:  # noqa: B902
+                put((done, error))
+            finally:
+                pages.close()
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                page, error = buffer.get()
+                if page is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield page
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _page_total(page: dict) -> typing.Optional[int]:
+        """Get the total amount of results reported by a page, if any."""
+        try:
+            return int(page["meta"]["total"])
+        except KeyError:
+            return None
+
+    @staticmethod
+    def _fetch_concurrently(
+        fetch_page: typing.Callable[[int], dict],
+        offsets: typing.Iterable[int],
+        max_workers: int,
+    ) -> typing.Generator[dict, None, None]:
+        """Fetch pages on a bounded thread pool, yielding them in order.
+
+        At most 2 * max_workers pages are requested ahead of the consumer,
+        so memory stays bounded on long scans.
+        """
+        offsets = iter(offsets)
+        pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            try:
+                for offset in itertools.islice(offsets, 2 * max_workers):
+                    pending.append(executor.submit(fetch_page, offset))
+
+                while pending:
+                    page = pending.popleft().result()
+                    for offset in itertools.islice(offsets, 1):
+                        pending.append(executor.submit(fetch_page, offset))
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
 
     def get_resource(
         self,
@@ -124,10 +478,36 @@ class ActiveCampaignAPI(BaseAPI):
         Returns:
             The given resource.
         """
-        path = self._prepare_path(resource_name, resource_id)
+        document = self.get_resource_document(resource_name, resource_id)
+        return document[singular_form(resource_name)]
+
+    def get_resource_document(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int],
+        query_params: typing.Optional[dict] = None,
+    ) -> dict:
+        """Get the whole response to a request for the given resource.
+
+        Besides the resource, it holds the related collections asked
+        for with the include query parameter.
+
+        Args:
+            resource_name: Name of the resource.
+            resource_id: The id of the object.
+            query_params: Query parameters to add, e.g. include.
+
+        Returns:
+            The decoded response.
+        """
+        path = self._prepare_path(
+            resource_name,
+            resource_id,
+            query_params=query_params,
+        )
         response = self._send_request(method=HttpMethod.GET, path=path)
         response.raise_for_status()
-        return response.json()[singular_form(resource_name)]
+        return self._decode(response)
 
     def create_resource(self, resource_name: str, data: dict) -> dict:
         """Create a resource with the given data.
@@ -147,10 +527,10 @@ class ActiveCampaignAPI(BaseAPI):
         resp = self._send_request(
             method=HttpMethod.POST,
             path=path,
-            data=json.dumps(payload),
+            data=self.codec.dumps(payload),
         )
         resp.raise_for_status()
-        return resp.json()[singular_form(resource_name)]
+        return self._decode(resp)[singular_form(resource_name)]
 
     def update_resource(
         self,
@@ -176,10 +556,10 @@ class ActiveCampaignAPI(BaseAPI):
         resp = self._send_request(
             method=HttpMethod.PUT,
             path=path,
-            data=json.dumps(payload),
+            data=self.codec.dumps(payload),
         )
         resp.raise_for_status()
-        return resp.json()[singular_form(resource_name)]
+        return self._decode(resp)[singular_form(resource_name)]
 
     def delete_resource(
         self, resource_name: str, resource_id: typing.Optional[int]
@@ -194,6 +574,68 @@ class ActiveCampaignAPI(BaseAPI):
         response = self._send_request(method=HttpMethod.DELETE, path=path)
         response.raise_for_status()
 
+    def sync_contact(self, data: dict) -> dict:
+        """Create or update the contact with the email in data.
+
+        Args:
+            data: The contact fields, including its email.
+
+        Returns:
+            The created or updated contact.
+        """
+        resp = self._send_request(
+            method=HttpMethod.POST,
+            path=self._prepare_path("contact/sync"),
+            data=self.codec.dumps({"contact": data}),
+        )
+        resp.raise_for_status()
+        return self._decode(resp)["contact"]
+
+    # Maximum number of contacts accepted by a single bulk import request
+    BULK_IMPORT_LIMIT = 250
+
+    def bulk_import(
+        self,
+        contacts: typing.List[dict],
+        callback: typing.Optional[dict] = None,
+    ) -> dict:
+        """Queue the import of many contacts at once.
+
+        Args:
+            contacts: Up to BULK_IMPORT_LIMIT contacts in the bulk import
+                format, each with its email, and optionally tags,
+                fields and subscribe/unsubscribe lists.
+            callback: Optional callback the server calls once done.
+
+        Returns:
+            The response, containing the batchId of the import.
+        """
+        payload = {"contacts": contacts}
+        if callback is not None:
+            payload["callback"] = callback
+
+        resp = self._send_request(
+            method=HttpMethod.POST,
+            path=self._prepare_path("import/bulk_import"),
+            data=self.codec.dumps(payload),
+        )
+        resp.raise_for_status()
+        return self._decode(resp)
+
+    def bulk_import_status(self, batch_id: str) -> dict:
+        """Get the status of a bulk import.
+
+        Args:
+            batch_id: The batchId returned by bulk_import.
+
+        Returns:
+            The status, with the success and failure lists once completed.
+        """
+        path = self._prepare_path("import/info", query_params={"batchId": batch_id})
+        resp = self._send_request(method=HttpMethod.GET, path=path)
+        resp.raise_for_status()
+        return self._decode(resp)
+
     @classmethod
     def _get_query_string(
         cls: typing.Type,
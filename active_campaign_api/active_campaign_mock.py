@@ -9,14 +9,19 @@ import requests
 from pathlib import PurePosixPath
 from urllib.parse import urlparse, parse_qs, unquote
 from .active_campaign_api import ActiveCampaignAPI
+from .client import use_client
 
 
 @pytest.fixture()
-def mock_active_campaign(requests_mock) -> typing.Callable:  # noqa
+def mock_active_campaign(requests_mock) -> typing.Iterator[typing.Callable]:  # noqa
     """Mock ActiveCampaign api calls.
 
     Currently only api calls used by patient app.
     Documentation: https://developers.activecampaign.com/reference
+
+    Resources use a client of their own during the test, without rate
+    limiting, so mocked responses are not throttled, and without circuit
+    breaker, so failures mocked in a test do not fail the next ones.
     """
 
     def _mock_active_campaign() -> None:  # noqa
@@ -79,6 +84,10 @@ def mock_active_campaign(requests_mock) -> typing.Callable:  # noqa
             status_code=200,
         )
 
+        requests_mock.post(
+            f"{root_url}/contact/sync", json=write_contact_callback, status_code=201
+        )
+
         def find_tag_callback(
             request: requests.PreparedRequest,
             context: typing.Callable,
@@ -170,4 +179,25 @@ def mock_active_campaign(requests_mock) -> typing.Callable:  # noqa
             f"{root_url}/contactTags", json=create_contact_tag_callback, status_code=201
         )
 
-    return _mock_active_campaign
+        def bulk_import_callback(
+            request: requests.PreparedRequest,
+            context: typing.Callable,
+        ) -> dict:
+            contacts = req_json_value(request, "contacts")
+
+            return {"success": 1, "queued_contacts": len(contacts), "batchId": "1"}
+
+        requests_mock.post(f"{root_url}/import/bulk_import", json=bulk_import_callback)
+
+        # without query params so as to match every batchId
+        requests_mock.get(
+            f"{root_url}/import/info",
+            json={"status": "completed", "success": [], "failure": []},
+        )
+
+    client = ActiveCampaignAPI()
+    client.rate_limiter = None
+    client.circuit_breaker = None
+    with use_client(client):
+        yield _mock_active_campaign
+    client.close()
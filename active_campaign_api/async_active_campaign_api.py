@@ -0,0 +1,212 @@
+"""Contains AsyncActiveCampaignAPI class"""
+
+import typing
+
+from django.conf import settings
+from .base_api import HttpMethod
+from .async_base_api import AsyncBaseAPI
+from .active_campaign_api import (
+    ActiveCampaignAPI,
+    build_circuit_breaker,
+    build_rate_limiter,
+    build_retry_policy,
+    require_setting,
+    singular_form,
+)
+
+
+class AsyncActiveCampaignAPI(AsyncBaseAPI):
+    """Handle marketing campaign tools from asyncio code.
+
+    Mirrors ActiveCampaignAPI, with every request method being a coroutine
+    and list_resources an async generator.
+    """
+
+    def __init__(self, transport: typing.Any = None) -> None:
+        """Initialize active campaign.
+
+        Args:
+            transport: Custom httpx transport, e.g. httpx.MockTransport in tests.
+        """
+        MARKETING_CAMPAIGN_KEY = require_setting("MARKETING_CAMPAIGN_KEY")
+        MARKETING_CAMPAIGN_URL = require_setting("MARKETING_CAMPAIGN_URL")
+        MARKETING_CAMPAIGN_REQUEST_TIMEOUT = getattr(
+            settings,
+            "MARKETING_CAMPAIGN_REQUEST_TIMEOUT",
+            None,
+        )
+        MARKETING_CAMPAIGN_POOL_MAXSIZE = getattr(
+            settings,
+            "MARKETING_CAMPAIGN_POOL_MAXSIZE",
+            10,
+        )
+
+        super().__init__(
+            MARKETING_CAMPAIGN_URL,
+            MARKETING_CAMPAIGN_REQUEST_TIMEOUT,
+            max_connections=MARKETING_CAMPAIGN_POOL_MAXSIZE,
+            max_keepalive_connections=MARKETING_CAMPAIGN_POOL_MAXSIZE,
+            transport=transport,
+            rate_limiter=build_rate_limiter(MARKETING_CAMPAIGN_URL),
+            retry_policy=build_retry_policy(),
+            circuit_breaker=build_circuit_breaker(),
+            coalesce_gets=getattr(settings, "MARKETING_CAMPAIGN_COALESCE_GETS", False),
+        )
+        self.headers.update({"Api-Token": MARKETING_CAMPAIGN_KEY})
+
+    LISTS = ActiveCampaignAPI.LISTS
+    PAGE_LIMIT = ActiveCampaignAPI.PAGE_LIMIT
+
+    async def list_resources(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int] = None,
+        nested_resource_name: typing.Optional[str] = None,
+        query_params: typing.Optional[dict] = None,
+    ) -> typing.AsyncGenerator[dict, None]:
+        """List all the recources of the given name.
+
+        See ActiveCampaignAPI.list_resources.
+
+        Yields:
+            A single resource from the server.
+        """
+        resource_key_in_response = resource_name
+        if resource_id and nested_resource_name:
+            # We want the list of nested_resource_name
+            resource_key_in_response = nested_resource_name
+
+        async for page in self.list_pages(
+            resource_name,
+            resource_id=resource_id,
+            nested_resource_name=nested_resource_name,
+            query_params=query_params,
+        ):
+            for resource_data in page[resource_key_in_response]:
+                yield resource_data
+
+    async def list_pages(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int] = None,
+        nested_resource_name: typing.Optional[str] = None,
+        query_params: typing.Optional[dict] = None,
+    ) -> typing.AsyncGenerator[dict, None]:
+        """List the decoded response of every page of the given resource.
+
+        See ActiveCampaignAPI.list_pages.
+
+        Yields:
+            The decoded body of a single page, in offset order.
+        """
+        query_params = dict(query_params or {})
+
+        async def fetch_page(offset: int) -> dict:
+            """Get the page starting at the given offset."""
+            path = ActiveCampaignAPI._prepare_path(
+                resource_name,
+                resource_id=resource_id,
+                nested_resource_name=nested_resource_name,
+                query_params={
+                    **query_params,
+                    "limit": self.PAGE_LIMIT,
+                    "offset": offset,
+                },
+            )
+            response = await self._send_request(method=HttpMethod.GET, path=path)
+            return self._decode(response)
+
+        page = await fetch_page(0)
+        yield page
+
+        total = ActiveCampaignAPI._page_total(page)
+        if total is None:
+            # Nested resources are not paginated
+            return
+
+        offset = self.PAGE_LIMIT
+        while offset < total:
+            page = await fetch_page(offset)
+            yield page
+            total = ActiveCampaignAPI._page_total(page) or total
+            offset += self.PAGE_LIMIT
+
+    async def get_resource(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int],
+    ) -> dict:
+        """Get details of the given resource.
+
+        Args:
+            resource_name: Name of the resource.
+            resource_id: The id of the object.
+
+        Returns:
+            The given resource.
+        """
+        path = ActiveCampaignAPI._prepare_path(resource_name, resource_id)
+        response = await self._send_request(method=HttpMethod.GET, path=path)
+        return self._decode(response)[singular_form(resource_name)]
+
+    async def create_resource(self, resource_name: str, data: dict) -> dict:
+        """Create a resource with the given data.
+
+        Args:
+            resource_name: The name of the resource
+            data: The data to create the resource with.
+
+        Returns:
+            The newly created resource.
+        """
+        path = ActiveCampaignAPI._prepare_path(resource_name)
+        payload = {
+            singular_form(resource_name): data,
+        }
+
+        resp = await self._send_request(
+            method=HttpMethod.POST,
+            path=path,
+            data=self.codec.dumps(payload),
+        )
+        return self._decode(resp)[singular_form(resource_name)]
+
+    async def update_resource(
+        self,
+        resource_name: str,
+        resource_id: typing.Optional[int],
+        data: dict,
+    ) -> dict:
+        """Update the given resource with the given data.
+
+        Args:
+            resource_name: The name of the recource to update
+            resource_id: The id of the resource.
+            data: The data to update the resource with.
+
+        Returns:
+            The update data.
+        """
+        path = ActiveCampaignAPI._prepare_path(resource_name, resource_id)
+        payload = {
+            singular_form(resource_name): data,
+        }
+
+        resp = await self._send_request(
+            method=HttpMethod.PUT,
+            path=path,
+            data=self.codec.dumps(payload),
+        )
+        return self._decode(resp)[singular_form(resource_name)]
+
+    async def delete_resource(
+        self, resource_name: str, resource_id: typing.Optional[int]
+    ) -> None:
+        """Delete the given resource.
+
+        Args:
+            resource_name: Name of the resource.
+            resource_id: The id of the object.
+        """
+        path = ActiveCampaignAPI._prepare_path(resource_name, resource_id)
+        await self._send_request(method=HttpMethod.DELETE, path=path)
@@ -0,0 +1,207 @@
+""" Generic asyncio API class """
+
+import time
+import typing
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .base_api import BaseAPI, HttpMethod
+from .rate_limit import RateLimiter
+from .codec import default_codec
+from .coalesce import AsyncSingleFlight
+from .instrumentation import RequestEvent
+from .retry import RetryPolicy, CircuitBreaker
+
+
+class AsyncBaseAPI:
+    """Base class for serving different APIs from an asyncio event loop.
+
+    Requires httpx. Connections are pooled by a single httpx.AsyncClient,
+    which must only be used from the event loop it was created in.
+    """
+
+    Error = BaseAPI.Error
+    CircuitOpenError = BaseAPI.CircuitOpenError
+
+    # The retry and circuit breaker logic is the same as the sync client's
+    _check_circuit = BaseAPI._check_circuit
+    _record_outcome = BaseAPI._record_outcome
+    _retry_delay = BaseAPI._retry_delay
+    _decode_ahead = BaseAPI._decode_ahead
+    _decode = BaseAPI._decode
+    _notify = BaseAPI._notify
+
+    def __init__(
+        self,
+        root_url: str,
+        request_timeout: int = 10,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        transport: typing.Optional["httpx.AsyncBaseTransport"] = None,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        retry_policy: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        codec: typing.Any = None,
+        coalesce_gets: bool = False,
+    ) -> None:
+        """Initialize the API client.
+
+        Args:
+            root_url: The url every request path is appended to.
+            request_timeout: Read timeout, in seconds.
+            max_connections: Maximum number of concurrent connections.
+            max_keepalive_connections: Maximum number of idle connections kept.
+            transport: Custom httpx transport, e.g. httpx.MockTransport in tests.
+            rate_limiter: Limiter every request waits on before being sent.
+            retry_policy: Policy for retrying failed requests. None to
+                raise on the first failure.
+            circuit_breaker: Breaker refusing requests while the server
+                keeps failing.
+            codec: Encodes request bodies and decodes responses.
+                Defaults to orjson when installed, json otherwise.
+            coalesce_gets: Send identical GET requests made by several
+                tasks at the same time only once, sharing the response.
+                A GET joining a request sent before the caller's own write
+                may return data from before that write.
+        """
+        if httpx is None:
+            raise RuntimeError("httpx must be installed to use the async client")
+
+        self.root_url = root_url
+        self.request_timeout = request_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec or default_codec()
+        self.coalesce_gets = coalesce_gets
+        self.headers = {"Content-Type": "application/json"}
+        self._client: typing.Optional["httpx.AsyncClient"] = None
+        self._in_flight = AsyncSingleFlight()
+        # Called with the RequestEvent of every request of this client,
+        # before the observers added with instrumentation.add_observer
+        self.observers: typing.List[typing.Callable[[RequestEvent], typing.Any]] = []
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        """Get the httpx client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(self.request_timeout, connect=3.05),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send_request(
+        self,
+        *,
+        method: HttpMethod,
+        path: str,
+        data: typing.Union[str, bytes] = None,
+        headers: typing.Dict[str, str] = None,
+    ) -> "httpx.Response":
+        """Send request function.
+
+        With coalesce_gets, a GET identical to one in flight waits for its
+        response instead of being sent.
+        """
+        if method is HttpMethod.GET and self.coalesce_gets:
+            key = (path, tuple(sorted((headers or {}).items())))
+            return await self._in_flight.do(
+                key,
+                lambda: self._send(method=method, path=path, headers=headers),
+            )
+        return await self._send(method=method, path=path, data=data, headers=headers)
+
+    async def _send(
+        self,
+        *,
+        method: HttpMethod,
+        path: str,
+        data: typing.Union[str, bytes] = None,
+        headers: typing.Dict[str, str] = None,
+    ) -> "httpx.Response":
+        """Send a request, retrying it according to the retry policy.
+
+        The body of the response is decoded before observers are notified,
+        so the event reports the decoding time apart from the latency.
+        """
+        event = RequestEvent(method.value, path)
+        started = time.monotonic()
+        try:
+            try:
+                response = await self._send_attempts(method, path, data, headers, event)
+            finally:
+                event.latency = time.monotonic() - started
+            self._decode_ahead(response, event)
+            return response
+        except BaseException as error:
+            event.error = error
+            raise
+        finally:
+            self._notify(event)
+
+    async def _send_attempts(
+        self,
+        method: HttpMethod,
+        path: str,
+        data: typing.Union[str, bytes, None],
+        headers: typing.Optional[typing.Dict[str, str]],
+        event: RequestEvent,
+    ) -> "httpx.Response":
+        """Send a request until it succeeds or may not be retried."""
+        attempt = 0
+        while True:
+            event.retries = attempt
+            self._check_circuit()
+            if self.rate_limiter is not None:
+                waiting = time.monotonic()
+                await self.rate_limiter.aacquire()
+                event.rate_limit_wait += time.monotonic() - waiting
+
+            try:
+                resp = await self.client.request(
+                    method.value,
+                    f"{self.root_url}{path}",
+                    content=data,
+                    headers=headers,
+                )
+            except httpx.TransportError:
+                self._record_outcome(None)
+                delay = self._retry_delay(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                event.status = resp.status_code
+                event.bytes = len(resp.content)
+                self._record_outcome(resp.status_code)
+                delay = self._retry_delay(
+                    method,
+                    attempt,
+                    resp.status_code,
+                    resp.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+                await resp.aclose()
+
+            await asyncio.sleep(delay)
+            attempt += 1
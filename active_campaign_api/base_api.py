@@ -1,8 +1,17 @@
 """ Generic API class """
 
 import enum
+import time
 import typing
+import weakref
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from .rate_limit import RateLimiter
+from .codec import default_codec
+from .coalesce import SingleFlight
+from .instrumentation import RequestEvent, notify
+from .retry import RetryPolicy, CircuitBreaker
 
 
 class AutoNameEnum(enum.Enum):
@@ -37,17 +46,113 @@ class HttpMethod(AutoNameEnum):
 
 
 class BaseAPI:
-    """Base class for serving different APIs."""
+    """Base class for serving different APIs.
+
+    Every thread gets its own ``requests.Session``, so a single instance can
+    be shared by the whole process. The sessions share one connection pool,
+    so threads of short-lived executors reuse the keep-alive connections
+    opened by earlier ones.
+    """
 
     class Error(BaseException):
         """Generic error class."""
 
-    def __init__(self, root_url: str, request_timeout: int = 10) -> None:
-        """Initialize requests session."""
+    class CircuitOpenError(Error, Exception):
+        """The circuit breaker refused to send the request.
+
+        Also an Exception, so the usual error handlers catch it.
+        """
+
+    def __init__(
+        self,
+        root_url: str,
+        request_timeout: int = 10,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        rate_limiter: typing.Optional[RateLimiter] = None,
+        retry_policy: typing.Optional[RetryPolicy] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        codec: typing.Any = None,
+        coalesce_gets: bool = False,
+    ) -> None:
+        """Initialize the API client.
+
+        Args:
+            root_url: The url every request path is appended to.
+            request_timeout: Read timeout, in seconds.
+            pool_connections: Number of host connection pools to cache.
+            pool_maxsize: Maximum number of connections kept per host,
+                shared by every thread.
+            rate_limiter: Limiter every request waits on before being sent.
+            retry_policy: Policy for retrying failed requests. None to
+                raise on the first failure.
+            circuit_breaker: Breaker refusing requests while the server
+                keeps failing.
+            codec: Encodes request bodies and decodes responses.
+                Defaults to orjson when installed, json otherwise.
+            coalesce_gets: Send identical GET requests made by several
+                threads at the same time only once, sharing the response.
+                A GET joining a request sent before the caller's own write
+                may return data from before that write.
+        """
         self.root_url = root_url
         self.request_timeout = request_timeout
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec or default_codec()
+        self.coalesce_gets = coalesce_gets
+        self.headers = {"Content-Type": "application/json"}
+        self._in_flight = SingleFlight()
+        # Called with the RequestEvent of every request of this client,
+        # before the observers added with instrumentation.add_observer
+        self.observers: typing.List[typing.Callable[[RequestEvent], typing.Any]] = []
+
+        self._local = threading.local()
+        self._sessions_lock = threading.Lock()
+        # Weak so sessions of finished worker threads can be collected
+        self._sessions: typing.MutableSet[requests.Session] = weakref.WeakSet()
+        # Thread-safe, and holds the connections, so shared by every session
+        self._adapter = self._create_adapter()
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the requests session of the current thread."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.add(session)
+        return session
+
+    def _create_adapter(self) -> HTTPAdapter:
+        """Create the sized connection pool shared by the sessions."""
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+
+    def _create_session(self) -> requests.Session:
+        """Create a session sending requests through the shared pool."""
+        session = requests.Session()
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def close(self) -> None:
+        """Close the sessions opened by every thread and their connections."""
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+            adapter, self._adapter = self._adapter, self._create_adapter()
+        for session in sessions:
+            session.close()
+        adapter.close()
+        self._local = threading.local()
 
     def _send_request(
         self,
@@ -57,8 +162,56 @@ class BaseAPI:
         data: typing.Union[str, bytes] = None,
         headers: typing.Dict[str, str] = None,
     ) -> requests.Response:
-        """Send request function."""
+        """Send request function.
+
+        With coalesce_gets, a GET identical to one in flight waits for its
+        response instead of being sent.
+        """
+        if method is HttpMethod.GET and self.coalesce_gets:
+            key = (path, tuple(sorted((headers or {}).items())))
+            return self._in_flight.do(
+                key,
+                lambda: self._send(method=method, path=path, headers=headers),
+            )
+        return self._send(method=method, path=path, data=data, headers=headers)
 
+    def _send(
+        self,
+        *,
+        method: HttpMethod,
+        path: str,
+        data: typing.Union[str, bytes] = None,
+        headers: typing.Dict[str, str] = None,
+    ) -> requests.Response:
+        """Send a request, retrying it according to the retry policy.
+
+        The body of the response is decoded before observers are notified,
+        so the event reports the decoding time apart from the latency.
+        """
+        event = RequestEvent(method.value, path)
+        started = time.monotonic()
+        try:
+            try:
+                response = self._send_attempts(method, path, data, headers, event)
+            finally:
+                event.latency = time.monotonic() - started
+            self._decode_ahead(response, event)
+            return response
+        except BaseException as error:
+            event.error = error
+            raise
+        finally:
+            self._notify(event)
+
+    def _send_attempts(
+        self,
+        method: HttpMethod,
+        path: str,
+        data: typing.Union[str, bytes, None],
+        headers: typing.Optional[typing.Dict[str, str]],
+        event: RequestEvent,
+    ) -> requests.Response:
+        """Send a request until it succeeds or may not be retried."""
         req = requests.Request(
             method=method.value,
             url=f"{self.root_url}{path}",
@@ -67,10 +220,104 @@ class BaseAPI:
         )
         prepared_req = self.session.prepare_request(req)
 
-        resp = self.session.send(
-            prepared_req,
-            timeout=(3.05, self.request_timeout),
-            # https://requests.readthedocs.io/en/master/user/advanced/#timeouts
+        attempt = 0
+        while True:
+            event.retries = attempt
+            self._check_circuit()
+            if self.rate_limiter is not None:
+                waiting = time.monotonic()
+                self.rate_limiter.acquire()
+                event.rate_limit_wait += time.monotonic() - waiting
+
+            try:
+                resp = self.session.send(
+                    prepared_req,
+                    timeout=(3.05, self.request_timeout),
+                    # https://requests.readthedocs.io/en/master/user/advanced/#timeouts
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self._record_outcome(None)
+                delay = self._retry_delay(method, attempt)
+                if delay is None:
+                    raise
+            else:
+                event.status = resp.status_code
+                event.bytes = len(resp.content)
+                self._record_outcome(resp.status_code)
+                delay = self._retry_delay(
+                    method,
+                    attempt,
+                    resp.status_code,
+                    resp.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+                resp.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _decode_ahead(self, response: typing.Any, event: RequestEvent) -> None:
+        """Decode the JSON body of a response for _decode, timing it."""
+        if not response.content:
+            return
+        started = time.monotonic()
+        try:
+            response._decoded = self.codec.loads(response.content)
+        except Exception:
+            # Left to _decode, which raises to the caller
+            pass
+        finally:
+            event.decode = time.monotonic() - started
+
+    def _decode(self, response: typing.Any) -> typing.Any:
+        """Decode the JSON body of a response.
+
+        The body decoded by _send is handed to the first caller only, so
+        callers sharing a coalesced response never share its body.
+        """
+        decoded = response.__dict__.pop("_decoded", None)
+        if decoded is not None:
+            return decoded
+        return self.codec.loads(response.content)
+
+    def _notify(self, event: RequestEvent) -> None:
+        """Report a request to the observers of this client and global ones."""
+        notify(event, self.observers)
+
+    def _check_circuit(self) -> None:
+        """Raise CircuitOpenError if the circuit breaker refuses requests."""
+        if self.circuit_breaker is not None:
+            if not self.circuit_breaker.allow_request():
+                raise self.CircuitOpenError(f"{self.root_url} is unavailable")
+
+    def _record_outcome(self, status: typing.Optional[int]) -> None:
+        """Report the outcome of a request to the circuit breaker.
+
+        Args:
+            status: The response status, None if the connection failed.
+        """
+        if self.circuit_breaker is None:
+            return
+        if status is None or status >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _retry_delay(
+        self,
+        method: HttpMethod,
+        attempt: int,
+        status: typing.Optional[int] = None,
+        retry_after: typing.Optional[str] = None,
+    ) -> typing.Optional[float]:
+        """Get the delay before retrying, None if the request must not be."""
+        if self.retry_policy is None or (status is not None and status < 400):
+            return None
+        return self.retry_policy.retry_delay(
+            method.value,
+            attempt,
+            status,
+            retry_after,
         )
-        resp.raise_for_status()
-        return resp
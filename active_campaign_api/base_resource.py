@@ -2,11 +2,75 @@
 
 import abc
 import typing
-from .active_campaign_api import ActiveCampaignAPI
+from .active_campaign_api import ActiveCampaignAPI, singular_form
+from django.http import Http404
+from .client import get_client, get_async_client
+from .concurrency import map_concurrently
+from .replica import get_replica
+from .async_active_campaign_api import AsyncActiveCampaignAPI
+
+# Where resources are read from
+API = "api"
+REPLICA = "replica"
+
+
+class ResourceView:
+    """A read-only view over a row returned by the API.
+
+    Fields are converted from the raw row only when accessed, which makes
+    views much cheaper to build and hold than full resources.
+    Use materialize to get a full resource, e.g. to save it.
+    """
+
+    __slots__ = ("_resource_class", "_data")
+
+    def __init__(self, resource_class: typing.Type["Resource"], data: dict) -> None:
+        """Initialize the view.
+
+        Args:
+            resource_class: The class of the viewed resource.
+            data: The API payload of a single resource.
+        """
+        self._resource_class = resource_class
+        self._data = data
+
+    @property
+    def id(self) -> typing.Optional[int]:  # noqa: A003
+        """Get id of the resource."""
+        return self._data.get("id")
+
+    def __getattr__(self, attribute: str) -> typing.Any:
+        """Get the value of the API field mapped to the attribute."""
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        fieldname = self._resource_class._attribute_to_field_name().get(attribute)
+        if fieldname is None:
+            raise AttributeError(attribute)
+        return self._data.get(fieldname)
+
+    def materialize(self) -> "Resource":
+        """Build the full resource from the row."""
+        return self._resource_class._from_api_data(self._data)
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return f"<{self._resource_class.__name__} view {self.id}>"
 
 
 class Resource(abc.ABC):
-    """An ActiveCampaign API resource."""
+    """An ActiveCampaign API resource.
+
+    Resources declare __slots__ to keep large collections compact.
+    """
+
+    __slots__ = ("_id", "_created", "_loaded", "_related")
+
+    # Resources referencing others (e.g. ContactTag) have a higher order,
+    # so batched writes create their dependencies first.
+    write_order = 0
+
+    # Whether the API can list this resource by id (keyset pagination)
+    supports_keyset = False
 
     def __init__(self, **kwargs) -> None:
         """Initialize the Resource."""
@@ -15,11 +79,36 @@ class Resource(abc.ABC):
         # Whether the resource has been saved to remote.
         self._created = self._id is not None
 
+        # The serialized data last loaded from or saved to remote,
+        # None when unknown.
+        self._loaded: typing.Optional[dict] = None
+
+        # The related resources loaded along, by collection name
+        self._related: typing.Optional[typing.Dict[str, list]] = None
+
     @property
     def id(self) -> typing.Optional[int]:  # noqa: A003
         """Get id of the resource."""
         return self._id
 
+    @classmethod
+    def api(cls) -> ActiveCampaignAPI:
+        """Get the client used to talk to the API server.
+
+        Returns:
+            The process-wide client. See client.use_client to replace it.
+        """
+        return get_client()
+
+    @classmethod
+    def async_api(cls) -> AsyncActiveCampaignAPI:
+        """Get the async client of the running event loop.
+
+        Returns:
+            The loop-wide client. See client.use_async_client to replace it.
+        """
+        return get_async_client()
+
     @staticmethod
     @abc.abstractmethod
     def resource_name() -> str:
@@ -32,6 +121,41 @@ class Resource(abc.ABC):
         """Map between API field names and attribute names."""
         raise NotImplementedError()
 
+    @staticmethod
+    def related_resources() -> typing.Dict[str, typing.Tuple[type, str]]:
+        """Map the related collections the API can embed in a response.
+
+        Returns:
+            The resource class of every collection, and the API field of
+            its rows holding the id of this resource, by collection name.
+        """
+        return {}
+
+    @classmethod
+    def _field_maps(cls) -> typing.Tuple[dict, dict, tuple]:
+        """Get the field maps of this class, compiled on first use.
+
+        Returns:
+            The API field name to attribute map (including id), its inverse
+            without id, and the (field name, attribute) pairs to serialize.
+        """
+        maps = cls.__dict__.get("_compiled_field_maps")
+        if maps is None:
+            field_attribute_map = cls.map_field_name_to_attribute()
+            to_attribute = {"id": "_id", **field_attribute_map}
+            to_field = {
+                attribute: fieldname
+                for fieldname, attribute in field_attribute_map.items()
+            }
+            maps = (to_attribute, to_field, tuple(field_attribute_map.items()))
+            cls._compiled_field_maps = maps
+        return maps
+
+    @classmethod
+    def _attribute_to_field_name(cls) -> dict:
+        """Map between attribute names and API field names."""
+        return cls._field_maps()[1]
+
     @classmethod
     def _to_api_payload(cls, data: dict) -> dict:
         """Convert a dict containing attribute: value to APIField: value.
@@ -42,15 +166,12 @@ class Resource(abc.ABC):
         Returns:
             A dict in the format the API will accept.
         """
-        result = {}
-        field_attribute_map = cls.map_field_name_to_attribute()
-
-        for fieldname in field_attribute_map:
-            for attribute in data:
-                if field_attribute_map[fieldname] == attribute:
-                    result[fieldname] = data[attribute]
-
-        return result
+        to_field = cls._field_maps()[1]
+        return {
+            to_field[attribute]: value
+            for attribute, value in data.items()
+            if attribute in to_field
+        }
 
     @classmethod
     def _to_attribute_dict(cls, data: dict) -> dict:
@@ -62,21 +183,287 @@ class Resource(abc.ABC):
         Returns:
             The converted dict.
         """
-        field_attribute_map = {"id": "_id"}
-        field_attribute_map.update(cls.map_field_name_to_attribute())
-
+        to_attribute = cls._field_maps()[0]
         return {
-            field_attribute_map[fieldname]: value
+            to_attribute[fieldname]: value
             for fieldname, value in data.items()
-            if field_attribute_map.get(fieldname) is not None
+            if fieldname in to_attribute
         }
 
+    @classmethod
+    def _from_api_data(cls, data: dict) -> "Resource":
+        """Build a saved resource from a row returned by the API.
+
+        Args:
+            data: The API payload of a single resource
+
+        Returns:
+            An instance of the resource.
+        """
+        resource = cls(**cls._to_attribute_dict(data))
+        resource._created = True
+        resource._loaded = resource.serialize_data()
+        return resource
+
+    @classmethod
+    def from_api_rows(cls, rows: typing.Iterable[dict]) -> typing.List["Resource"]:
+        """Build saved resources from a page of rows returned by the API.
+
+        Args:
+            rows: The API payloads of the resources
+
+        Returns:
+            The instances of the resources, in the same order.
+        """
+        to_attribute = cls._field_maps()[0]
+        resources = []
+        for data in rows:
+            resource = cls(
+                **{
+                    to_attribute[fieldname]: value
+                    for fieldname, value in data.items()
+                    if fieldname in to_attribute
+                }
+            )
+            resource._created = True
+            resource._loaded = resource.serialize_data()
+            resources.append(resource)
+        return resources
+
+    @classmethod
+    def to_api_rows(cls, resources: typing.Iterable["Resource"]) -> typing.List[dict]:
+        """Serialize many resources at once.
+
+        Args:
+            resources: The resources to serialize
+
+        Returns:
+            The API payload of every resource, in the same order.
+        """
+        return [resource.serialize_data() for resource in resources]
+
+    @classmethod
+    def _list_target(
+        cls,
+        parent_resource_id: typing.Optional[int] = None,
+        parent_resource_name: typing.Optional[str] = None,
+    ) -> typing.Tuple[str, typing.Optional[str]]:
+        """Get the resource and nested resource names to list from.
+
+        Returns:
+            The resource_name and nested_resource_name to request.
+        """
+        if parent_resource_id and parent_resource_name:
+            # We want to list nested_resource_name
+            return parent_resource_name, cls.resource_name()
+        # Default and most common usage
+        return cls.resource_name(), None
+
+    @classmethod
+    def _include_params(cls, include: typing.Iterable[str]) -> dict:
+        """Get the query parameters embedding the related collections."""
+        unknown = set(include) - set(cls.related_resources())
+        if unknown:
+            raise ValueError(f"{cls.__name__} cannot include {', '.join(unknown)}")
+        return {"include": ",".join(include)}
+
+    @classmethod
+    def attach_related(
+        cls,
+        resources: typing.Iterable["Resource"],
+        related_rows: typing.Dict[str, typing.Iterable[dict]],
+    ) -> None:
+        """Attach related rows to the resources they reference.
+
+        Args:
+            resources: The resources to attach to.
+            related_rows: API rows of related collections, by collection
+                name. Every resource gets a list for every collection,
+                empty if no row references it.
+        """
+        related_resources = cls.related_resources()
+        by_id = {}
+        for resource in resources:
+            resource._related = {**(resource._related or {})}
+            resource._related.update((name, []) for name in related_rows)
+            by_id[str(resource.id)] = resource
+
+        for name, rows in related_rows.items():
+            related_class, fieldname = related_resources[name]
+            rows = list(rows)
+            for data, related in zip(rows, related_class.from_api_rows(rows)):
+                parent = by_id.get(str(data.get(fieldname)))
+                if parent is not None:
+                    parent._related[name].append(related)
+
+    @classmethod
+    def related_rows(
+        cls,
+        resource_ids: typing.Iterable[typing.Union[int, str]],
+        include: typing.Iterable[str],
+        max_workers: typing.Optional[int] = None,
+        fan_out: bool = False,
+    ) -> typing.Dict[str, typing.List[dict]]:
+        """Fetch the API rows of related collections of many resources.
+
+        By default the resources are listed again with the ids filter and the
+        collections embedded, which costs one request per PAGE_LIMIT
+        resources for every collection at once. Only resources supporting
+        the ids filter, such as contacts, can be listed this way. With
+        fan_out, every collection is listed per resource instead.
+
+        Args:
+            resource_ids: The ids of the resources.
+            include: The related collections, see related_resources.
+            max_workers: Threads used to send the requests.
+            fan_out: List the collections per resource.
+
+        Returns:
+            The rows of every collection, by collection name.
+        """
+        api = cls.api()
+        include = list(include)
+        include_params = cls._include_params(include)
+        resource_ids = [str(resource_id) for resource_id in resource_ids]
+
+        if fan_out:
+            items = [
+                (name, resource_id)
+                for name in include
+                for resource_id in resource_ids
+            ]
+
+            def fetch(item: typing.Tuple[str, str]) -> typing.Dict[str, list]:
+                name, resource_id = item
+                rows = api.list_resources(
+                    cls.resource_name(),
+                    resource_id=resource_id,
+                    nested_resource_name=name,
+                )
+                return {name: list(rows)}
+
+        else:
+            items = [
+                resource_ids[start : start + api.PAGE_LIMIT]
+                for start in range(0, len(resource_ids), api.PAGE_LIMIT)
+            ]
+
+            def fetch(chunk: typing.List[str]) -> typing.Dict[str, list]:
+                pages = list(
+                    api.list_pages(
+                        cls.resource_name(),
+                        query_params={"ids": ",".join(chunk), **include_params},
+                    )
+                )
+                return {
+                    name: [data for page in pages for data in page.get(name) or ()]
+                    for name in include
+                }
+
+        related_rows = {name: [] for name in include}
+        for _, rows, error in map_concurrently(fetch, items, max_workers):
+            if error is not None:
+                raise error
+            for name, data in rows.items():
+                related_rows[name].extend(data)
+        return related_rows
+
+    @classmethod
+    def prefetch_related(
+        cls,
+        resources: typing.Iterable["Resource"],
+        include: typing.Iterable[str],
+        max_workers: typing.Optional[int] = None,
+        fan_out: bool = False,
+    ) -> typing.List["Resource"]:
+        """Load related collections of many resources in as few requests as
+        possible, and attach them to the resources.
+
+        Args:
+            resources: The resources, e.g. a page of contacts.
+            include: The related collections, see related_resources.
+            max_workers: Threads used to send the requests.
+            fan_out: List the collections per resource, see related_rows.
+
+        Returns:
+            The resources, with related set for every collection.
+        """
+        resources = list(resources)
+        related_rows = cls.related_rows(
+            [resource.id for resource in resources],
+            include,
+            max_workers=max_workers,
+            fan_out=fan_out,
+        )
+        cls.attach_related(resources, related_rows)
+        return resources
+
+    @classmethod
+    def _replica_related_rows(
+        cls,
+        resources: typing.List["Resource"],
+        include: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.List[dict]]:
+        """Get the related rows of the resources from the replica.
+
+        Collections the replica does not hold, such as fieldValues, raise a
+        ValueError rather than being fetched from the API.
+        """
+        replica = get_replica()
+        related_resources = cls.related_resources()
+        include = list(include)
+        cls._include_params(include)
+        missing = [
+            name
+            for name in include
+            if not replica.has_table(related_resources[name][0])
+        ]
+        if missing:
+            raise ValueError(f"The replica does not hold {', '.join(missing)}")
+
+        related_rows = {}
+        for name in include:
+            related_class, fieldname = related_resources[name]
+            related_rows[name] = [
+                data
+                for resource in resources
+                for data in replica.filter_rows(related_class, {fieldname: resource.id})
+            ]
+        return related_rows
+
+    def related(self, name: str) -> list:
+        """Get the related resources loaded along with this one.
+
+        Args:
+            name: The name of the related collection, e.g. contactTags.
+
+        Returns:
+            The related resources.
+        """
+        if self._related is None or name not in self._related:
+            raise ValueError(f"{name} were not loaded, pass include=[{name!r}]")
+        return self._related[name]
+
+    @staticmethod
+    def _check_source(source: str) -> str:
+        """Make sure resources can be read from source."""
+        if source not in (API, REPLICA):
+            raise ValueError(f"Unknown source {source!r}")
+        return source
+
     @classmethod
     def filter(
         cls: typing.Type,
         filters: dict,
         parent_resource_id: typing.Optional[int] = None,
         parent_resource_name: typing.Optional[str] = None,
+        max_workers: typing.Optional[int] = None,
+        prefetch: int = 0,
+        lazy: bool = False,
+        source: str = API,
+        keyset: bool = False,
+        after_id: typing.Optional[int] = None,
+        include: typing.Optional[typing.Iterable[str]] = None,
     ) -> typing.Generator:  # noqa: A003
         """Filter the list of resources with the given filters.
 
@@ -87,40 +474,112 @@ class Resource(abc.ABC):
                 The id of the parent resource
             parent_resource_name: typing.Optional[str]
                 The name of the parent resource
+            max_workers: typing.Optional[int]
+                Fetch pages concurrently with up to this many threads
+            prefetch: int
+                Fetch up to this many pages ahead in a background thread
+            lazy: bool
+                Yield ResourceViews over the raw rows instead of resources
+            source: str
+                "replica" to read from the local replica instead of the API
+            keyset: bool
+                Paginate by id, for resources with supports_keyset
+            after_id: typing.Optional[int]
+                In keyset mode, start after the resource with this id
+            include: typing.Optional[typing.Iterable[str]]
+                Related collections to load along, see related_resources
 
         Yields:
             One recource at a time matching the filters.
         """
-        # Default and most common usage
-        resource_name = cls.resource_name()
-        nested_resource_name = None
-
-        if parent_resource_id and parent_resource_name:
-            # We want to list nested_resource_name
-            resource_name = parent_resource_name
-            nested_resource_name = cls.resource_name()
+        if keyset and not cls.supports_keyset:
+            raise ValueError(f"{cls.__name__} does not support keyset pagination")
+        include = list(include or ())
+        if include and lazy:
+            raise ValueError("Related resources cannot be included in lazy views")
+        query_params = filters
+        if include:
+            query_params = {**filters, **cls._include_params(include)}
+
+        if cls._check_source(source) == REPLICA:
+            rows = get_replica().filter_rows(
+                cls,
+                filters,
+                parent_resource_id=parent_resource_id,
+                parent_resource_name=parent_resource_name,
+            )
+            if lazy:
+                yield from (ResourceView(cls, data) for data in rows)
+                return
+            resources = cls.from_api_rows(rows)
+            if include:
+                cls.attach_related(
+                    resources, cls._replica_related_rows(resources, include)
+                )
+            yield from resources
+            return
+
+        resource_name, nested_resource_name = cls._list_target(
+            parent_resource_id,
+            parent_resource_name,
+        )
 
-        data_list = ActiveCampaignAPI().list_resources(
+        pages = cls.api().list_pages(
             resource_name=resource_name,
             resource_id=parent_resource_id,
             nested_resource_name=nested_resource_name,
-            query_params=filters,
+            query_params=query_params,
+            max_workers=max_workers,
+            prefetch=prefetch,
+            keyset=keyset,
+            after_id=after_id,
         )
-
-        for data in data_list:
-            resource_data = cls._to_attribute_dict(data)
-            resource = cls(**resource_data)
-            resource._created = True
-            yield resource
+        resource_key_in_response = nested_resource_name or resource_name
+
+        for page in pages:
+            rows = page[resource_key_in_response]
+            if lazy:
+                yield from (ResourceView(cls, data) for data in rows)
+                continue
+            resources = cls.from_api_rows(rows)
+            if include:
+                cls.attach_related(
+                    resources, {name: page.get(name) or () for name in include}
+                )
+            yield from resources
 
     @classmethod
-    def all(cls) -> typing.Generator:  # noqa: A003
+    def all(  # noqa: A003
+        cls,
+        max_workers: typing.Optional[int] = None,
+        prefetch: int = 0,
+        lazy: bool = False,
+        source: str = API,
+        keyset: bool = False,
+        after_id: typing.Optional[int] = None,
+    ) -> typing.Generator:
         """Generate all the resources of this type.
 
+        Args:
+            max_workers: Fetch pages concurrently with up to this many threads
+            prefetch: Fetch up to this many pages ahead in a background thread
+            lazy: Yield ResourceViews over the raw rows instead of resources
+            source: "replica" to read from the local replica instead of the API
+            keyset: Paginate by id, for resources with supports_keyset
+            after_id: In keyset mode, start after the resource with this id
+
         Yields:
             One recource at a time.
         """
-        for resource in cls.filter({}):
+        for resource in cls.filter(
+            {},
+            max_workers=max_workers,
+            prefetch=prefetch,
+            lazy=lazy,
+            source=source,
+            keyset=keyset,
+            after_id=after_id,
+        ):
             yield resource
 
     @classmethod
@@ -128,6 +587,7 @@ class Resource(abc.ABC):
         cls,
         parent_resource_name: str,
         parent_resource_id: int,
+        source: str = API,
     ) -> typing.Generator:
         """Get all instances of this resource inside of the
         parent_resource_name with the given parent_resource_id.
@@ -137,6 +597,8 @@ class Resource(abc.ABC):
                 The name of the parent resource
             resource_id: int
                 The id of the parent recource
+            source: str
+                "replica" to read from the local replica instead of the API
 
         Yields:
             One recource at a time
@@ -145,66 +607,276 @@ class Resource(abc.ABC):
             {},
             parent_resource_id=parent_resource_id,
             parent_resource_name=parent_resource_name,
+            source=source,
         ):
             yield resource
 
     @classmethod
-    def get(cls, resource_id: typing.Optional[int]) -> "Resource":
+    def get(
+        cls,
+        resource_id: typing.Optional[int],
+        source: str = API,
+        include: typing.Optional[typing.Iterable[str]] = None,
+    ) -> "Resource":
         """Get the recource with the given id.
 
         Args:
             resource_id: The id of the recource.
+            source: "replica" to read from the local replica instead of the API
+            include: Related collections to load along, see related_resources
 
         Returns:
             An instance of the resource.
         """
-        data = ActiveCampaignAPI().get_resource(
+        include = list(include or ())
+        if cls._check_source(source) == REPLICA:
+            data = get_replica().get_row(cls, resource_id)
+            if data is None:
+                raise Http404
+            resource = cls._from_api_data(data)
+            if include:
+                cls.attach_related(
+                    [resource], cls._replica_related_rows([resource], include)
+                )
+            return resource
+
+        if not include:
+            data = cls.api().get_resource(
+                cls.resource_name(),
+                resource_id,
+            )
+            return cls._from_api_data(data)
+
+        document = cls.api().get_resource_document(
             cls.resource_name(),
             resource_id,
+            query_params=cls._include_params(include),
+        )
+        resource = cls._from_api_data(document[singular_form(cls.resource_name())])
+        cls.attach_related(
+            [resource], {name: document.get(name) or () for name in include}
         )
-        resource_data = cls._to_attribute_dict(data)
-        resource = cls(**resource_data)
-        resource._created = True
         return resource
 
     def delete(self) -> None:
         """Delete the resource from the server."""
-        ActiveCampaignAPI().delete_resource(self.resource_name(), self.id)
+        self.api().delete_resource(self.resource_name(), self.id)
         self._created = False
+        self._loaded = None
+
+    def save(self, force: bool = False) -> bool:
+        """Save the resource to the API server.
 
-    def save(self) -> None:
-        """Save the resource to the API server."""
+        An existing resource only sends the fields changed since it was
+        loaded or last saved, and nothing at all if none changed.
+
+        Args:
+            force: Send every field, even if unchanged.
+
+        Returns:
+            Whether a request was sent.
+        """
         if not self._created:
             self._create()
-        else:
-            self._update()
+            return True
+
+        data = self.serialize_data() if force else self.changed_fields()
+        if not data:
+            return False
+        self._update(data)
+        return True
+
+    def changed_fields(self) -> dict:
+        """Get the fields changed since last loaded or saved.
+
+        Returns:
+            The API payload of the changed fields. Every field if the
+            remote values are unknown.
+        """
+        data = self.serialize_data()
+        if self._loaded is None:
+            return data
+        return {
+            fieldname: value
+            for fieldname, value in data.items()
+            if fieldname not in self._loaded or self._loaded[fieldname] != value
+        }
+
+    def has_changes(self) -> bool:
+        """Whether save would send a request."""
+        return not self._created or bool(self.changed_fields())
 
     def serialize_data(self) -> dict:
         """Create an API payload from resource attributes.
 
+        Attributes holding another resource are sent as its id.
+
         Returns:
             A dict containing the serialized data
         """
-        field_attribute_map = self.map_field_name_to_attribute()
-        return {
-            fieldname: getattr(self, attribute)
-            for fieldname, attribute in field_attribute_map.items()
-        }
+        data = {}
+        for fieldname, attribute in self._field_maps()[2]:
+            value = getattr(self, attribute)
+            if isinstance(value, Resource):
+                value = value.id
+            data[fieldname] = value
+        return data
+
+    def dependencies(self) -> typing.List["Resource"]:
+        """Get the resources referenced by the attributes of this one."""
+        return [
+            value
+            for value in (
+                getattr(self, attribute) for _, attribute in self._field_maps()[2]
+            )
+            if isinstance(value, Resource)
+        ]
 
     def _create(self) -> None:
         """Create the resource."""
         data = self.serialize_data()
-        self._id = ActiveCampaignAPI().create_resource(
+        self._id = self.api().create_resource(
             self.resource_name(),
             data=data,
         )["id"]
         self._created = True
+        self._loaded = data
+
+    def _update(self, data: typing.Optional[dict] = None) -> None:
+        """Update the resource.
+
+        Args:
+            data: The fields to send. Defaults to every field.
+        """
+        if data is None:
+            data = self.serialize_data()
+        self.api().update_resource(
+            self.resource_name(),
+            resource_id=self.id,
+            data=data,
+        )
+        self._loaded = {**(self._loaded or {}), **data}
+
+    @classmethod
+    async def afilter(
+        cls: typing.Type,
+        filters: dict,
+        parent_resource_id: typing.Optional[int] = None,
+        parent_resource_name: typing.Optional[str] = None,
+    ) -> typing.AsyncGenerator:
+        """Filter the list of resources with the given filters.
+
+        Async counterpart of filter.
+
+        Yields:
+            One recource at a time matching the filters.
+        """
+        resource_name, nested_resource_name = cls._list_target(
+            parent_resource_id,
+            parent_resource_name,
+        )
+
+        async for data in cls.async_api().list_resources(
+            resource_name=resource_name,
+            resource_id=parent_resource_id,
+            nested_resource_name=nested_resource_name,
+            query_params=filters,
+        ):
+            yield cls._from_api_data(data)
+
+    @classmethod
+    async def aall(cls) -> typing.AsyncGenerator:
+        """Generate all the resources of this type.
+
+        Async counterpart of all.
+
+        Yields:
+            One recource at a time.
+        """
+        async for resource in cls.afilter({}):
+            yield resource
+
+    @classmethod
+    async def aget_all_in(
+        cls,
+        parent_resource_name: str,
+        parent_resource_id: int,
+    ) -> typing.AsyncGenerator:
+        """Get all instances of this resource inside of the given parent.
+
+        Async counterpart of get_all_in.
+
+        Yields:
+            One recource at a time
+        """
+        async for resource in cls.afilter(
+            {},
+            parent_resource_id=parent_resource_id,
+            parent_resource_name=parent_resource_name,
+        ):
+            yield resource
 
-    def _update(self) -> None:
-        """Update the resource."""
+    @classmethod
+    async def aget(cls, resource_id: typing.Optional[int]) -> "Resource":
+        """Get the recource with the given id.
+
+        Async counterpart of get.
+
+        Returns:
+            An instance of the resource.
+        """
+        data = await cls.async_api().get_resource(
+            cls.resource_name(),
+            resource_id,
+        )
+        return cls._from_api_data(data)
+
+    async def adelete(self) -> None:
+        """Delete the resource from the server."""
+        await self.async_api().delete_resource(self.resource_name(), self.id)
+        self._created = False
+        self._loaded = None
+
+    async def asave(self, force: bool = False) -> bool:
+        """Save the resource to the API server.
+
+        Async counterpart of save.
+
+        Returns:
+            Whether a request was sent.
+        """
+        if not self._created:
+            await self._acreate()
+            return True
+
+        data = self.serialize_data() if force else self.changed_fields()
+        if not data:
+            return False
+        await self._aupdate(data)
+        return True
+
+    async def _acreate(self) -> None:
+        """Create the resource."""
         data = self.serialize_data()
-        ActiveCampaignAPI().update_resource(
+        created = await self.async_api().create_resource(
+            self.resource_name(),
+            data=data,
+        )
+        self._id = created["id"]
+        self._created = True
+        self._loaded = data
+
+    async def _aupdate(self, data: typing.Optional[dict] = None) -> None:
+        """Update the resource.
+
+        Args:
+            data: The fields to send. Defaults to every field.
+        """
+        if data is None:
+            data = self.serialize_data()
+        await self.async_api().update_resource(
             self.resource_name(),
             resource_id=self.id,
             data=data,
         )
+        self._loaded = {**(self._loaded or {}), **data}
@@ -0,0 +1,166 @@
+"""Process-wide registry of the ActiveCampaignAPI client used by resources"""
+
+import typing
+import asyncio
+import weakref
+import threading
+import contextlib
+
+from django.core.signals import setting_changed
+from .active_campaign_api import ActiveCampaignAPI
+from .async_active_campaign_api import AsyncActiveCampaignAPI
+
+_lock = threading.Lock()
+_client: typing.Optional[ActiveCampaignAPI] = None
+
+# httpx clients are bound to the loop they were created in, so keep one per loop
+_async_clients: typing.MutableMapping[
+    asyncio.AbstractEventLoop, AsyncActiveCampaignAPI
+] = weakref.WeakKeyDictionary()
+_async_override: typing.Optional[AsyncActiveCampaignAPI] = None
+_closing: typing.Set["asyncio.Task"] = set()
+
+
+def get_client() -> ActiveCampaignAPI:
+    """Get the shared client, creating it on first use.
+
+    Returns:
+        The ActiveCampaignAPI instance shared by the whole process.
+    """
+    global _client
+
+    client = _client
+    if client is None:
+        with _lock:
+            if _client is None:
+                _client = ActiveCampaignAPI()
+            client = _client
+    return client
+
+
+def set_client(client: typing.Optional[ActiveCampaignAPI]) -> None:
+    """Replace the shared client.
+
+    Args:
+        client: The client to share. None to build a new one from
+            django settings on next use.
+    """
+    global _client
+
+    with _lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def reset_client() -> None:
+    """Close the shared clients so they are rebuilt on next use.
+
+    The async clients are closed on their event loop, in the background
+    when the loop is running.
+    """
+    set_client(None)
+    with _lock:
+        clients = list(_async_clients.items())
+        _async_clients.clear()
+    for loop, client in clients:
+        _close_on_loop(loop, client)
+
+
+def _close_on_loop(
+    loop: asyncio.AbstractEventLoop,
+    client: AsyncActiveCampaignAPI,
+) -> None:
+    """Close an async client on the event loop it is bound to."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if loop.is_closed():
+        # Its connections went away with the loop
+        return
+    if running is loop:
+        task = loop.create_task(client.aclose())
+        # The loop only keeps a weak reference to its tasks
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    elif running is None:
+        loop.run_until_complete(client.aclose())
+
+
+@contextlib.contextmanager
+def use_client(client: ActiveCampaignAPI) -> typing.Iterator[ActiveCampaignAPI]:
+    """Temporarily share the given client, e.g. in tests.
+
+    Args:
+        client: The client resources should use inside the block.
+
+    Yields:
+        The given client.
+    """
+    global _client
+
+    with _lock:
+        previous, _client = _client, client
+    try:
+        yield client
+    finally:
+        with _lock:
+            _client = previous
+
+
+def get_async_client() -> AsyncActiveCampaignAPI:
+    """Get the async client of the running event loop, creating it on first use.
+
+    The client is closed by reset_client, and when a MARKETING_CAMPAIGN_*
+    setting changes.
+
+    Returns:
+        The AsyncActiveCampaignAPI instance shared by the running loop.
+    """
+    if _async_override is not None:
+        return _async_override
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncActiveCampaignAPI()
+    return client
+
+
+@contextlib.contextmanager
+def use_async_client(
+    client: AsyncActiveCampaignAPI,
+) -> typing.Iterator[AsyncActiveCampaignAPI]:
+    """Temporarily share the given async client, e.g. in tests.
+
+    The caller owns the client and must close it with aclose.
+
+    Args:
+        client: The client async resource methods should use inside the block.
+
+    Yields:
+        The given client.
+    """
+    global _async_override
+
+    with _lock:
+        previous, _async_override = _async_override, client
+    try:
+        yield client
+    finally:
+        with _lock:
+            _async_override = previous
+
+
+def _reset_on_setting_change(setting: str, **kwargs: typing.Any) -> None:
+    """Drop the shared client when a MARKETING_CAMPAIGN_* setting changes."""
+    if setting.startswith("MARKETING_CAMPAIGN_"):
+        reset_client()
+
+
+setting_changed.connect(_reset_on_setting_change)
@@ -0,0 +1,120 @@
+"""Coalescing of identical calls running at the same time"""
+
+import typing
+import asyncio
+import threading
+
+T = typing.TypeVar("T")
+
+
+class _Call:
+    """A call in flight, waited on by the callers sharing it."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        """Initialize a pending call."""
+        self.done = threading.Event()
+        self.result: typing.Any = None
+        self.error: typing.Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share one call between threads making the same call at the same time.
+
+    The first thread calling do with a key runs the function, the threads
+    calling it with the same key meanwhile wait and get its result or
+    error. Calls starting after it completed run the function again, so
+    nothing is cached.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: typing.Dict[typing.Hashable, _Call] = {}
+
+    def do(self, key: typing.Hashable, func: typing.Callable[[], T]) -> T:
+        """Run func, or wait for the call in flight with the same key.
+
+        Args:
+            key: Identifies identical calls.
+            func: The call to make.
+
+        Returns:
+            The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Share one call between tasks making the same call at the same time.
+
+    Async counterpart of SingleFlight, for a single event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without calls in flight."""
+        self._calls: typing.Dict[typing.Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: typing.Hashable,
+        func: typing.Callable[[], typing.Awaitable[T]],
+    ) -> T:
+        """Run func, or wait for the call in flight with the same key.
+
+        Args:
+            key: Identifies identical calls.
+            func: The coroutine function making the call.
+
+        Returns:
+            The result of the call.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The task making the call was cancelled, not this one
+                return await self.do(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Nobody may be waiting, do not warn about an unretrieved error
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,52 @@
+"""JSON codecs used to encode requests and decode responses"""
+
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    """Codec based on the json module of the standard library."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(data: typing.Any) -> bytes:
+        """Encode data as JSON."""
+        return json.dumps(data).encode()
+
+    @staticmethod
+    def loads(content: typing.Union[str, bytes]) -> typing.Any:
+        """Decode a JSON document."""
+        return json.loads(content)
+
+
+class OrjsonCodec:
+    """Codec based on orjson, several times faster than the json module."""
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(data: typing.Any) -> bytes:
+        """Encode data as JSON."""
+        return orjson.dumps(data)
+
+    @staticmethod
+    def loads(content: typing.Union[str, bytes]) -> typing.Any:
+        """Decode a JSON document."""
+        return orjson.loads(content)
+
+
+def default_codec() -> typing.Union[JSONCodec, OrjsonCodec]:
+    """Get the fastest codec available.
+
+    Returns:
+        An OrjsonCodec if orjson is installed, a JSONCodec otherwise.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
@@ -0,0 +1,107 @@
+"""Helpers to send many API requests concurrently"""
+
+import typing
+import concurrent.futures
+
+from django.conf import settings
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
+def default_max_workers() -> int:
+    """Get the number of threads bulk operations use by default."""
+    return getattr(settings, "MARKETING_CAMPAIGN_MAX_WORKERS", 4)
+
+
+def map_concurrently(
+    func: typing.Callable[[T], R],
+    items: typing.Iterable[T],
+    max_workers: typing.Optional[int] = None,
+    on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+) -> typing.List[typing.Tuple[T, typing.Optional[R], typing.Optional[BaseException]]]:
+    """Call func on every item on a thread pool, collecting every outcome.
+
+    Requests still go through the rate limiter of the client, so the pool
+    only allows waiting on several responses at once.
+
+    Args:
+        func: The function to call on every item.
+        items: The items to process.
+        max_workers: Threads to use. Defaults to MARKETING_CAMPAIGN_MAX_WORKERS.
+        on_progress: Called with the number of processed and total items
+            after each item.
+
+    Returns:
+        The (item, result, error) of every item, in the order of items.
+        Exactly one of result and error is set, unless func returned None.
+    """
+    items = list(items)
+    outcomes: typing.List = [None] * len(items)
+    if not items:
+        return outcomes
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers or default_max_workers()
+    ) as executor:
+        futures = {
+            executor.submit(func, item): index for index, item in enumerate(items)
+        }
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            index = futures[future]
+            try:
+                outcomes[index] = (items[index], future.result(), None)
+            except Exception as error:
+                outcomes[index] = (items[index], None, error)
+            if on_progress is not None:
+                on_progress(done, len(items))
+
+    return outcomes
+
+
+class BulkResult:
+    """Outcome of a bulk operation on many contacts."""
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        # Contacts a request was sent for
+        self.changed: typing.List = []
+        # Contacts that were already in the requested state
+        self.skipped: typing.List = []
+        # (contact id, error) of every failed contact
+        self.errors: typing.List[typing.Tuple[typing.Any, BaseException]] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every contact succeeded."""
+        return not self.errors
+
+    def collect(
+        self,
+        outcomes: typing.List[
+            typing.Tuple[typing.Any, typing.Optional[bool], typing.Optional[Exception]]
+        ],
+    ) -> "BulkResult":
+        """Add the outcomes of map_concurrently over contact ids.
+
+        Args:
+            outcomes: The (contact id, changed, error) of every contact.
+
+        Returns:
+            This result.
+        """
+        for contact_id, changed, error in outcomes:
+            if error is not None:
+                self.errors.append((contact_id, error))
+            elif changed:
+                self.changed.append(contact_id)
+            else:
+                self.skipped.append(contact_id)
+        return self
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return (
+            f"<BulkResult changed={len(self.changed)} "
+            f"skipped={len(self.skipped)} errors={len(self.errors)}>"
+        )
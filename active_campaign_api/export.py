@@ -0,0 +1,401 @@
+"""Resumable export of every resource of a type to a file"""
+
+import os
+import csv
+import glob
+import json
+import typing
+
+from .codec import default_codec
+from .base_resource import Resource
+from .incremental_sync import CacheCheckpointStore, FileCheckpointStore
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+class NDJSONWriter:
+    """Write every API row as is, one JSON document per line."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: The file to write.
+        """
+        self.path = path
+        self.codec = default_codec()
+        self._fh: typing.Optional[typing.BinaryIO] = None
+
+    def can_resume(self, state: dict) -> bool:
+        """Whether the file still holds the rows written until a checkpoint."""
+        try:
+            return os.path.getsize(self.path) >= state["size"]
+        except OSError:
+            return False
+
+    def open(self, state: typing.Optional[dict]) -> None:
+        """Open the file, truncated to the last checkpoint if resuming.
+
+        Args:
+            state: What commit returned at the last checkpoint, None to
+                start over.
+        """
+        if state is None:
+            self._fh = open(self.path, "wb")
+        else:
+            # Drop the rows written after the checkpoint
+            self._fh = open(self.path, "r+b")
+            self._fh.truncate(state["size"])
+            self._fh.seek(state["size"])
+
+    def write(self, rows: typing.List[dict]) -> None:
+        """Write API rows."""
+        self._fh.write(b"".join(self.codec.dumps(row) + b"\n" for row in rows))
+
+    def commit(self) -> dict:
+        """Make the rows written so far durable.
+
+        Returns:
+            The state to resume from.
+        """
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        return {"size": self._fh.tell()}
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class CSVWriter(NDJSONWriter):
+    """Write the rows as CSV, with a header of the API field names.
+
+    The columns are the fields of the first row written, unless given.
+    Fields missing from a row are left empty, and fields missing from the
+    first row are dropped. Nested values, such as links, are written as
+    JSON.
+    """
+
+    def __init__(
+        self, path: str, columns: typing.Optional[typing.List[str]] = None
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: The file to write.
+            columns: The API fields to write, in order. Defaults to the
+                fields of the first row.
+        """
+        super().__init__(path)
+        self.columns = columns
+
+    def open(self, state: typing.Optional[dict]) -> None:
+        """Open the file, truncated to the last checkpoint if resuming."""
+        super().open(state)
+        if state is not None and state.get("columns"):
+            self.columns = state["columns"]
+        self._header = state is None or not state.get("columns")
+
+    def write(self, rows: typing.List[dict]) -> None:
+        """Write API rows."""
+        if self.columns is None:
+            self.columns = _columns(rows[0])
+        lines = _CSVLines()
+        writer = csv.writer(lines)
+        if self._header:
+            writer.writerow(self.columns)
+            self._header = False
+        writer.writerows(
+            [_to_text(row.get(column)) for column in self.columns] for row in rows
+        )
+        self._fh.write("".join(lines).encode())
+
+    def commit(self) -> dict:
+        """Make the rows written so far durable.
+
+        Returns:
+            The state to resume from.
+        """
+        return {**super().commit(), "columns": self.columns}
+
+
+class _CSVLines(list):
+    """Collect the lines formatted by a csv.writer."""
+
+    write = list.append
+
+
+class ParquetWriter:
+    """Write the rows as Parquet files in a directory, one per checkpoint.
+
+    Requires pyarrow. The rows since the last checkpoint are held in memory.
+    Columns are chosen as by CSVWriter, and every value is stored as text.
+    """
+
+    def __init__(
+        self, path: str, columns: typing.Optional[typing.List[str]] = None
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            path: The directory to write the part files to.
+            columns: The API fields to write, in order. Defaults to the
+                fields of the first row.
+        """
+        if pyarrow is None:
+            raise RuntimeError("pyarrow must be installed to export to Parquet")
+
+        self.path = path
+        self.columns = columns
+        self._rows: typing.List[dict] = []
+        self._parts = 0
+
+    def _part(self, index: int) -> str:
+        """Get the path of a part file."""
+        return os.path.join(self.path, f"part-{index:05d}.parquet")
+
+    def can_resume(self, state: dict) -> bool:
+        """Whether the parts written until a checkpoint are still there."""
+        return all(os.path.exists(self._part(index)) for index in range(state["parts"]))
+
+    def open(self, state: typing.Optional[dict]) -> None:
+        """Create the directory, removing the parts after the last checkpoint."""
+        os.makedirs(self.path, exist_ok=True)
+        self._parts = state["parts"] if state else 0
+        if state and state.get("columns"):
+            self.columns = state["columns"]
+        for part in glob.glob(os.path.join(self.path, "part-*.parquet")):
+            index = int(os.path.basename(part)[5:-8])
+            if index >= self._parts:
+                os.unlink(part)
+
+    def write(self, rows: typing.List[dict]) -> None:
+        """Buffer API rows until the next commit."""
+        if self.columns is None:
+            self.columns = _columns(rows[0])
+        self._rows.extend(rows)
+
+    def commit(self) -> dict:
+        """Write the buffered rows as a new part file.
+
+        Returns:
+            The state to resume from.
+        """
+        if self._rows:
+            table = pyarrow.table(
+                {
+                    column: [_to_text(row.get(column)) for row in self._rows]
+                    for column in self.columns
+                }
+            )
+            pyarrow.parquet.write_table(table, self._part(self._parts))
+            self._parts += 1
+            self._rows = []
+        return {"parts": self._parts, "columns": self.columns}
+
+    def close(self) -> None:
+        """Drop the rows that were not committed."""
+        self._rows = []
+
+
+def _columns(row: dict) -> typing.List[str]:
+    """Get the columns of a row, id first."""
+    return ["id", *(field for field in row if field != "id")]
+
+
+def _to_text(value: typing.Any) -> typing.Optional[str]:
+    """Convert an API value to a string column, as the API mostly sends."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+WRITERS = {
+    "ndjson": NDJSONWriter,
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+}
+
+
+# Nested resources, only listed per contact
+PER_CONTACT = ("contactTags", "contactLists")
+
+
+class ResourceExporter:
+    """Stream every resource of a type to a file, resuming after failures.
+
+    Usage:
+        exporter = ResourceExporter(
+            Contact,
+            NDJSONWriter("contacts.ndjson"),
+            FileCheckpointStore("contacts.ndjson.checkpoint"),
+        )
+        exporter.run()
+
+    Pages are written as they are fetched, so memory does not grow with the
+    number of resources. Every few pages the file is synced and the position
+    of the next page is saved: the last id for resources supporting keyset
+    pagination, the offset otherwise. Running an interrupted export again
+    continues from the last checkpoint.
+
+    Contact tags and contact lists can only be listed per contact: they are
+    fetched embedded in pages of contacts, and the position is the last
+    contact id.
+    """
+
+    def __init__(
+        self,
+        resource_class: typing.Type[Resource],
+        writer: typing.Union[NDJSONWriter, ParquetWriter],
+        store: typing.Union[FileCheckpointStore, CacheCheckpointStore],
+        key: typing.Optional[str] = None,
+        checkpoint_every: int = 10,
+        query_params: typing.Optional[dict] = None,
+        prefetch: int = 1,
+    ) -> None:
+        """Initialize the export.
+
+        Args:
+            resource_class: The type of resources to export.
+            writer: Where to write the rows.
+            store: Where the checkpoint is kept.
+            key: The name of the checkpoint in the store. Defaults to the
+                resource name.
+            checkpoint_every: Pages written between two checkpoints.
+            query_params: Filters of the listed resources, or of the
+                contacts for contact tags and contact lists.
+            prefetch: Pages fetched ahead while the current one is written.
+        """
+        self.resource_class = resource_class
+        self.writer = writer
+        self.store = store
+        self.key = key or f"export:{resource_class.resource_name()}"
+        self.checkpoint_every = checkpoint_every
+        self.query_params = query_params or {}
+        self.prefetch = prefetch
+
+    def checkpoint(self) -> typing.Optional[dict]:
+        """Get the last checkpoint of an unfinished export, if any.
+
+        A checkpoint whose rows are no longer in the output, e.g. because
+        the file was deleted, is ignored and the export starts over.
+        """
+        value = self.store.load(self.key)
+        if value is None:
+            return None
+        checkpoint = json.loads(value)
+        if checkpoint.get("complete"):
+            return None
+        if not self.writer.can_resume(checkpoint["writer"]):
+            return None
+        return checkpoint
+
+    def _pages(
+        self, position: dict
+    ) -> typing.Iterator[typing.Tuple[typing.List[dict], dict]]:
+        """Fetch the pages after a position.
+
+        Yields:
+            The rows of every page, and the position after it.
+        """
+        resource_name = self.resource_class.resource_name()
+        if resource_name in PER_CONTACT:
+            from .resources import Contact
+
+            pages = Contact.api().list_pages(
+                Contact.resource_name(),
+                query_params=self.query_params,
+                prefetch=self.prefetch,
+                keyset=True,
+                after_id=position.get("after_id"),
+            )
+            for page in pages:
+                contacts = page[Contact.resource_name()]
+                if contacts:
+                    rows = Contact.related_rows(
+                        [contact["id"] for contact in contacts], [resource_name]
+                    )[resource_name]
+                    yield rows, {"after_id": contacts[-1]["id"]}
+            return
+
+        keyset = self.resource_class.supports_keyset
+        pages = self.resource_class.api().list_pages(
+            resource_name,
+            query_params=self.query_params,
+            prefetch=self.prefetch,
+            keyset=keyset,
+            after_id=position.get("after_id"),
+            start_offset=position.get("offset", 0),
+        )
+        for page in pages:
+            rows = page[resource_name]
+            if rows:
+                if keyset:
+                    position = {"after_id": rows[-1]["id"]}
+                else:
+                    position = {"offset": position["offset"] + len(rows)}
+                yield rows, position
+
+    def run(
+        self,
+        resume: bool = True,
+        on_progress: typing.Optional[typing.Callable[[int], typing.Any]] = None,
+    ) -> int:
+        """Export every resource.
+
+        Args:
+            resume: Continue from the last checkpoint, if any.
+            on_progress: Called with the number of rows exported after
+                each checkpoint.
+
+        Returns:
+            The number of rows in the file.
+        """
+        checkpoint = self.checkpoint() if resume else None
+        keyset = (
+            self.resource_class.supports_keyset
+            or self.resource_class.resource_name() in PER_CONTACT
+        )
+        position = {"after_id": None} if keyset else {"offset": 0}
+        rows_written = 0
+        if checkpoint is not None:
+            position = checkpoint["position"]
+            rows_written = checkpoint["rows"]
+
+        self.writer.open(checkpoint["writer"] if checkpoint else None)
+        try:
+            pending = 0
+            for rows, position in self._pages(position):
+                if rows:
+                    self.writer.write(rows)
+                    rows_written += len(rows)
+
+                pending += 1
+                if pending >= self.checkpoint_every:
+                    self._save(position, rows_written)
+                    pending = 0
+                    if on_progress is not None:
+                        on_progress(rows_written)
+
+            self._save(position, rows_written, complete=True)
+            if on_progress is not None:
+                on_progress(rows_written)
+        finally:
+            self.writer.close()
+        return rows_written
+
+    def _save(self, position: dict, rows: int, complete: bool = False) -> None:
+        """Make the written rows durable, then record where to resume from."""
+        checkpoint = {
+            "position": position,
+            "rows": rows,
+            "writer": self.writer.commit(),
+            "complete": complete,
+        }
+        self.store.save(self.key, json.dumps(checkpoint))
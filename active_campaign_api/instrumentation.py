@@ -0,0 +1,247 @@
+"""Observers of the requests sent to the API"""
+
+import re
+import bisect
+import typing
+import logging
+import threading
+import contextlib
+import collections
+
+logger = logging.getLogger(__name__)
+
+# Path segments that are ids, left out of the resource name
+_ID_SEGMENT = re.compile(r"^\d+$")
+
+
+def resource_from_path(path: str) -> str:
+    """Get the resource name of a request path.
+
+    Nested resources are joined with a slash, e.g. /contacts/1/contactTags
+    is contacts/contactTags.
+    """
+    segments = path.split("?", 1)[0].strip("/").split("/")
+    return "/".join(segment for segment in segments if not _ID_SEGMENT.match(segment))
+
+
+class RequestEvent:
+    """A request sent to the API, reported to observers once completed."""
+
+    __slots__ = (
+        "method",
+        "path",
+        "resource",
+        "status",
+        "bytes",
+        "latency",
+        "retries",
+        "rate_limit_wait",
+        "decode",
+        "error",
+    )
+
+    def __init__(self, method: str, path: str) -> None:
+        """Initialize the event of a request being sent.
+
+        Args:
+            method: The HTTP method.
+            path: The request path, with the query string.
+        """
+        self.method = method
+        self.path = path
+        self.resource = resource_from_path(path)
+        # The status of the last response, None if no response came
+        self.status: typing.Optional[int] = None
+        # The size of the body of the last response
+        self.bytes = 0
+        # Seconds from the first attempt to the outcome, including retries
+        # and rate limit waits but not decoding the response
+        self.latency = 0.0
+        self.retries = 0
+        # Seconds spent waiting on the rate limiter
+        self.rate_limit_wait = 0.0
+        # Seconds spent decoding the body of the response, after latency
+        self.decode = 0.0
+        # The error raised to the caller, if any
+        self.error: typing.Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return (
+            f"<RequestEvent {self.method} {self.resource} {self.status} "
+            f"{self.latency * 1000:.0f}ms>"
+        )
+
+
+Observer = typing.Callable[[RequestEvent], typing.Any]
+
+_observers: typing.List[Observer] = []
+_observers_lock = threading.Lock()
+
+
+def add_observer(observer: Observer) -> None:
+    """Call observer with the event of every request of every client."""
+    with _observers_lock:
+        _observers.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    """Stop calling an observer added with add_observer."""
+    with _observers_lock:
+        _observers.remove(observer)
+
+
+def notify(event: RequestEvent, observers: typing.Iterable[Observer] = ()) -> None:
+    """Report an event to the given observers, then to the global ones.
+
+    Observers run once the request completed, so their errors are logged
+    instead of replacing the outcome of the request.
+    """
+    for observer in (*observers, *_observers):
+        try:
+            observer(event)
+        except Exception:
+            logger.exception("Observer %r failed on %r", observer, event)
+
+
+class CallCounter:
+    """Count requests by resource and method.
+
+    Usage:
+        counter = CallCounter()
+        add_observer(counter)
+        ...
+        counter.counts[("contacts", "GET")]
+    """
+
+    def __init__(self) -> None:
+        """Initialize without requests."""
+        self._lock = threading.Lock()
+        self.counts: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self.errors: typing.Counter[typing.Tuple[str, str]] = collections.Counter()
+        self.retries = 0
+        self.rate_limit_wait = 0.0
+        self.decode = 0.0
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Count a request."""
+        key = (event.resource, event.method)
+        with self._lock:
+            self.counts[key] += 1
+            if event.error is not None:
+                self.errors[key] += 1
+            self.retries += event.retries
+            self.rate_limit_wait += event.rate_limit_wait
+            self.decode += event.decode
+
+    @property
+    def total(self) -> int:
+        """Get the number of requests counted."""
+        return sum(self.counts.values())
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return f"<CallCounter total={self.total} errors={sum(self.errors.values())}>"
+
+
+class LatencyHistogram:
+    """Histogram of request latencies by resource and method."""
+
+    # Upper bounds of the buckets, in seconds
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: typing.Optional[typing.Sequence[float]] = None) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Ascending upper bounds of the buckets, in seconds.
+                A last bucket holds the slower requests.
+        """
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self._lock = threading.Lock()
+        self.counts: typing.Dict[typing.Tuple[str, str], typing.List[int]] = {}
+        self.sums: typing.Dict[typing.Tuple[str, str], float] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record the latency of a request."""
+        key = (event.resource, event.method)
+        index = bisect.bisect_left(self.buckets, event.latency)
+        with self._lock:
+            counts = self.counts.get(key)
+            if counts is None:
+                counts = self.counts[key] = [0] * (len(self.buckets) + 1)
+                self.sums[key] = 0.0
+            counts[index] += 1
+            self.sums[key] += event.latency
+
+    def quantile(self, resource: str, method: str, q: float) -> typing.Optional[float]:
+        """Estimate a latency quantile from the buckets.
+
+        Args:
+            resource: The resource name, as in RequestEvent.resource.
+            method: The HTTP method.
+            q: The quantile, between 0 and 1.
+
+        Returns:
+            The upper bound of the bucket holding the quantile, infinity for
+            the last bucket, or None without requests.
+        """
+        counts = self.counts.get((resource, method))
+        if not counts:
+            return None
+        rank = q * sum(counts)
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class RequestRecorder:
+    """Events and call counts collected by record_requests."""
+
+    def __init__(self) -> None:
+        """Initialize without requests."""
+        self._lock = threading.Lock()
+        self.events: typing.List[RequestEvent] = []
+        self.counter = CallCounter()
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record a request."""
+        with self._lock:
+            self.events.append(event)
+        self.counter(event)
+
+    def count(
+        self,
+        resource: typing.Optional[str] = None,
+        method: typing.Optional[str] = None,
+    ) -> int:
+        """Get the number of requests, optionally of a resource and method."""
+        return sum(
+            count
+            for (event_resource, event_method), count in self.counter.counts.items()
+            if resource in (None, event_resource) and method in (None, event_method)
+        )
+
+
+@contextlib.contextmanager
+def record_requests() -> typing.Iterator[RequestRecorder]:
+    """Record the requests sent by every client inside the block.
+
+    The recorder is a global observer, so it sees the requests of every
+    thread of the process while the block runs, including worker threads
+    of concurrent scans and unrelated code running at the same time.
+
+    Usage:
+        with record_requests() as recorder:
+            Contact.get(42, include=["contactTags"])
+        assert recorder.count("contacts", "GET") == 1
+    """
+    recorder = RequestRecorder()
+    add_observer(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_observer(recorder)
@@ -0,0 +1,209 @@
+"""Cache of resource lookups, shared through the django cache framework"""
+
+import typing
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+# Stored in place of a resource that was not found
+_NOT_FOUND = "__not_found__"
+
+
+class CachedLookupMixin:
+    """Cache the find lookups of a resource, e.g. Tag by name.
+
+    Entries are stored in the django cache, so they are shared by every
+    worker process. Keys embed a per-resource version that is bumped when a
+    resource of the class is saved or deleted through this library, which
+    invalidates every entry at once, including renamed ones.
+
+    Must be listed before Resource in the bases of the class.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _lookup_cache(cls) -> typing.Any:
+        """Get the django cache holding the lookups."""
+        return caches[getattr(settings, "MARKETING_CAMPAIGN_CACHE", "default")]
+
+    @classmethod
+    def _lookup_version_key(cls) -> str:
+        """Get the cache key of the lookup version of this resource."""
+        return f"active_campaign:{cls.resource_name()}:version"
+
+    @classmethod
+    def _lookup_key(cls, lookup: str, value: str) -> str:
+        """Get the cache key of a lookup.
+
+        Args:
+            lookup: The name of the lookup, e.g. 'tag'.
+            value: The value looked up.
+
+        Returns:
+            A key safe for every cache backend.
+        """
+        cache = cls._lookup_cache()
+        version_key = cls._lookup_version_key()
+        cache.add(version_key, 1, None)
+        version = cache.get(version_key, 1)
+        digest = hashlib.sha1(str(value).encode()).hexdigest()
+        return f"active_campaign:{cls.resource_name()}:{version}:{lookup}:{digest}"
+
+    @classmethod
+    async def _alookup_key(cls, lookup: str, value: str) -> str:
+        """Get the cache key of a lookup.
+
+        Async counterpart of _lookup_key.
+        """
+        cache = cls._lookup_cache()
+        version_key = cls._lookup_version_key()
+        await cache.aadd(version_key, 1, None)
+        version = await cache.aget(version_key, 1)
+        digest = hashlib.sha1(str(value).encode()).hexdigest()
+        return f"active_campaign:{cls.resource_name()}:{version}:{lookup}:{digest}"
+
+    @classmethod
+    def cached_lookup(
+        cls,
+        lookup: str,
+        value: str,
+        loader: typing.Callable[[], typing.Any],
+    ) -> typing.Any:
+        """Get a resource from the cache, loading it on a miss.
+
+        Http404 raised by the loader is cached too, for a shorter time.
+
+        Args:
+            lookup: The name of the lookup, e.g. 'tag'.
+            value: The value looked up.
+            loader: Finds the resource on the API server.
+
+        Returns:
+            The resource found.
+        """
+        ttl = getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300)
+        if not ttl:
+            return loader()
+
+        cache = cls._lookup_cache()
+        key = cls._lookup_key(lookup, value)
+        cached = cache.get(key)
+        if cached == _NOT_FOUND:
+            raise Http404
+        if cached is not None:
+            return cls._from_api_data(cached)
+
+        try:
+            resource = loader()
+        except Http404:
+            cache.set(key, _NOT_FOUND, cls._negative_ttl())
+            raise
+        cache.set(key, {"id": resource.id, **resource.serialize_data()}, ttl)
+        return resource
+
+    @classmethod
+    async def acached_lookup(
+        cls,
+        lookup: str,
+        value: str,
+        loader: typing.Callable[[], typing.Awaitable],
+    ) -> typing.Any:
+        """Get a resource from the cache, awaiting the loader on a miss.
+
+        Async counterpart of cached_lookup.
+        """
+        ttl = getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300)
+        if not ttl:
+            return await loader()
+
+        # The async cache methods, so the event loop is not blocked
+        cache = cls._lookup_cache()
+        key = await cls._alookup_key(lookup, value)
+        cached = await cache.aget(key)
+        if cached == _NOT_FOUND:
+            raise Http404
+        if cached is not None:
+            return cls._from_api_data(cached)
+
+        try:
+            resource = await loader()
+        except Http404:
+            await cache.aset(key, _NOT_FOUND, cls._negative_ttl())
+            raise
+        await cache.aset(key, {"id": resource.id, **resource.serialize_data()}, ttl)
+        return resource
+
+    @staticmethod
+    def _negative_ttl() -> int:
+        """Get the seconds a not found lookup is cached for."""
+        return getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_NEGATIVE_TTL", 60)
+
+    @classmethod
+    def invalidate_lookups(cls) -> None:
+        """Drop every cached lookup of this resource."""
+        if not getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300):
+            return
+        cache = cls._lookup_cache()
+        version_key = cls._lookup_version_key()
+        cache.add(version_key, 1, None)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Evicted in between, any new version works
+            cache.set(version_key, 2, None)
+
+    @classmethod
+    async def ainvalidate_lookups(cls) -> None:
+        """Drop every cached lookup of this resource.
+
+        Async counterpart of invalidate_lookups.
+        """
+        if not getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300):
+            return
+        cache = cls._lookup_cache()
+        version_key = cls._lookup_version_key()
+        await cache.aadd(version_key, 1, None)
+        try:
+            await cache.aincr(version_key)
+        except ValueError:
+            # Evicted in between, any new version works
+            await cache.aset(version_key, 2, None)
+
+    def save(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Save the resource and invalidate the cached lookups."""
+        written = None
+        try:
+            written = super().save(*args, **kwargs)
+            return written
+        finally:
+            # A failed request may still have been applied
+            if written is not False:
+                self.invalidate_lookups()
+
+    def delete(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Delete the resource and invalidate the cached lookups."""
+        try:
+            return super().delete(*args, **kwargs)
+        finally:
+            self.invalidate_lookups()
+
+    async def asave(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Save the resource and invalidate the cached lookups."""
+        written = None
+        try:
+            written = await super().asave(*args, **kwargs)
+            return written
+        finally:
+            # A failed request may still have been applied
+            if written is not False:
+                await self.ainvalidate_lookups()
+
+    async def adelete(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Delete the resource and invalidate the cached lookups."""
+        try:
+            return await super().adelete(*args, **kwargs)
+        finally:
+            await self.ainvalidate_lookups()
@@ -0,0 +1,124 @@
+"""Export every ActiveCampaign resource of a type to a file"""
+
+import os
+import typing
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from ...export import WRITERS, ResourceExporter
+from ...incremental_sync import FileCheckpointStore
+from ...resources import (
+    Contact,
+    ContactList,
+    ContactTag,
+    CustomField,
+    CustomFieldValue,
+    MarketingList,
+    Tag,
+)
+
+RESOURCES = {
+    resource_class.resource_name(): resource_class
+    for resource_class in (
+        Contact,
+        ContactList,
+        ContactTag,
+        CustomField,
+        CustomFieldValue,
+        MarketingList,
+        Tag,
+    )
+}
+
+
+class Command(BaseCommand):
+    """Export every resource of a type, resuming an interrupted export.
+
+    Usage:
+        python manage.py export_active_campaign contacts contacts.ndjson
+        python manage.py export_active_campaign contactTags tags.csv
+
+    NDJSON keeps the API rows as is. CSV and Parquet have a column per
+    field of the first row. Contact tags and contact lists are fetched
+    per page of contacts, which --filter applies to.
+    """
+
+    help = (
+        "Export every resource of a type to NDJSON, CSV or Parquet. "
+        "An interrupted export resumes from its last checkpoint."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("resource", choices=sorted(RESOURCES))
+        parser.add_argument(
+            "output",
+            help="The file to write, or the directory of the Parquet parts.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(WRITERS),
+            help="Defaults to the extension of the output.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="The checkpoint file. Defaults to the output with .checkpoint.",
+        )
+        parser.add_argument(
+            "--checkpoint-every",
+            type=int,
+            default=10,
+            help="Pages written between two checkpoints.",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="A query parameter of the listed resources, e.g. "
+            "filters[updated_after]=2024-01-01.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and start over.",
+        )
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        """Run the export."""
+        output = options["output"]
+        export_format = options["format"] or os.path.splitext(output)[1][1:]
+        if export_format not in WRITERS:
+            raise CommandError(
+                f"Unknown format '{export_format}', use --format to set one"
+            )
+
+        query_params = {}
+        for query_filter in options["filter"]:
+            name, separator, value = query_filter.partition("=")
+            if not separator:
+                raise CommandError(f"Filters must be NAME=VALUE, got '{query_filter}'")
+            query_params[name] = value
+
+        resource_class = RESOURCES[options["resource"]]
+        try:
+            writer = WRITERS[export_format](output)
+        except RuntimeError as error:
+            raise CommandError(str(error))
+
+        exporter = ResourceExporter(
+            resource_class,
+            writer,
+            FileCheckpointStore(options["checkpoint"] or f"{output}.checkpoint"),
+            checkpoint_every=options["checkpoint_every"],
+            query_params=query_params,
+        )
+
+        checkpoint = None if options["restart"] else exporter.checkpoint()
+        if checkpoint is not None:
+            self.stdout.write(f"Resuming after {checkpoint['rows']} rows")
+
+        rows = exporter.run(
+            resume=not options["restart"],
+            on_progress=lambda count: self.stdout.write(f"{count} rows exported"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} {options['resource']}"))
@@ -0,0 +1,154 @@
+"""Token bucket rate limiter shared across threads and processes"""
+
+import os
+import time
+import struct
+import typing
+import asyncio
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # No flock (e.g. Windows): the bucket is only shared by threads
+    fcntl = None
+
+
+class RateLimiter:
+    """A token bucket limiting the rate of requests.
+
+    Callers reserve a token and sleep until it is due, so bursts are queued
+    and spread out instead of being rejected. When path is given, the bucket
+    state lives in that file and is guarded by flock, so every process on the
+    host using the same path shares a single bucket.
+    """
+
+    # tokens left, time of last update
+    _STATE = struct.Struct("dd")
+
+    def __init__(
+        self,
+        rate: float,
+        burst: typing.Optional[float] = None,
+        path: typing.Optional[str] = None,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Requests allowed per second.
+            burst: Requests allowed at once after idling. Defaults to rate.
+            path: File holding the shared bucket state. None to only
+                coordinate the threads of this process.
+        """
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.path = path if fcntl is not None else None
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            The seconds spent waiting.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """Wait, without blocking the event loop, until a request may be sent.
+
+        Returns:
+            The seconds spent waiting.
+        """
+        if self.path is None:
+            wait = self._reserve()
+        else:
+            # flock waits on the other processes, keep it off the event loop
+            wait = await asyncio.get_running_loop().run_in_executor(
+                None, self._reserve
+            )
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def metrics(self) -> dict:
+        """Get the wait statistics of this process.
+
+        Returns:
+            A dict with the number of acquired and delayed requests,
+            and the total and maximum seconds spent waiting.
+        """
+        with self._lock:
+            return {
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "total_wait": self._total_wait,
+                "max_wait": self._max_wait,
+            }
+
+    def _reserve(self) -> float:
+        """Take a token, possibly ahead of time.
+
+        Returns:
+            The seconds to wait until the token is due.
+        """
+        with self._lock:
+            if self.path is None:
+                self._tokens, self._updated, wait = self._take(
+                    self._tokens, self._updated
+                )
+            else:
+                wait = self._reserve_shared()
+
+            self._acquired += 1
+            if wait > 0:
+                self._waited += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+        return wait
+
+    def _reserve_shared(self) -> float:
+        """Take a token from the bucket stored in self.path."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, self._STATE.size, 0)
+            if len(raw) == self._STATE.size:
+                tokens, updated = self._STATE.unpack(raw)
+            else:
+                tokens, updated = self.burst, time.time()
+
+            tokens, updated, wait = self._take(tokens, updated)
+            os.pwrite(fd, self._STATE.pack(tokens, updated), 0)
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+        return wait
+
+    def _take(
+        self,
+        tokens: float,
+        updated: float,
+    ) -> typing.Tuple[float, float, float]:
+        """Refill the bucket and take a token from it.
+
+        Tokens go negative when requests are queued ahead of the rate.
+
+        Returns:
+            The tokens left, the update time and the seconds to wait.
+        """
+        now = time.time()
+        elapsed = max(0.0, now - updated)
+        tokens = min(self.burst, tokens + elapsed * self.rate) - 1
+        wait = max(0.0, -tokens / self.rate)
+        return tokens, now, wait
@@ -0,0 +1,365 @@
+"""Local SQLite read replica of ActiveCampaign resources"""
+
+import typing
+import sqlite3
+import threading
+
+from django.conf import settings
+from .active_campaign_api import singular_form
+
+# Contacts whose memberships are fetched before being written
+PAGE_CONTACTS = 10000
+
+# Columns indexed for the common lookups, by resource name
+INDEXES = {
+    "contacts": ("email",),
+    "tags": ("tag",),
+    "lists": ("name",),
+    "contactTags": ("contact", "tag"),
+    "contactLists": ("contact", "list"),
+}
+
+
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class Replica:
+    """A local SQLite mirror of contacts, tags, lists and their memberships.
+
+    Each resource gets a table named after it, with an id column and one
+    TEXT column per API field. The replica is filled by load, and can be
+    kept up to date with apply_change. Resources read from it with
+    source="replica", e.g. Contact.find(email, source="replica").
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the replica.
+
+        Args:
+            path: The SQLite database file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def default_resources() -> typing.List[typing.Type]:
+        """Get the resource classes mirrored by default."""
+        from .resources import Contact, ContactList, ContactTag, MarketingList, Tag
+
+        return [Contact, Tag, MarketingList, ContactTag, ContactList]
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _columns(resource_class: typing.Type) -> typing.List[str]:
+        """Get the API fields stored for a resource class."""
+        return list(resource_class.map_field_name_to_attribute())
+
+    def create_tables(
+        self,
+        resource_classes: typing.Optional[typing.Iterable[typing.Type]] = None,
+    ) -> None:
+        """Create the tables and indexes of the given resource classes."""
+        for resource_class in resource_classes or self.default_resources():
+            name = resource_class.resource_name()
+            columns = ", ".join(
+                f"{_quote(column)} TEXT" for column in self._columns(resource_class)
+            )
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(name)} "
+                f"(id TEXT PRIMARY KEY, {columns})"
+            )
+            for column in INDEXES.get(name, ()):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'{name}_{column}')} "
+                    f"ON {_quote(name)} ({_quote(column)})"
+                )
+
+    def load(
+        self,
+        resource_classes: typing.Optional[typing.Iterable[typing.Type]] = None,
+        max_workers: typing.Optional[int] = None,
+    ) -> typing.Dict[str, int]:
+        """Replace the content of the replica with the API data.
+
+        Top level resources are loaded page by page. Memberships are fetched
+        embedded in pages of the contacts of the replica, so contacts must
+        be loaded first.
+
+        Args:
+            resource_classes: The resource classes to load. Defaults to
+                contacts, tags, lists, contact tags and contact lists.
+            max_workers: Threads used to fetch pages and memberships.
+
+        Returns:
+            The number of rows loaded, by resource name.
+        """
+        resource_classes = list(resource_classes or self.default_resources())
+        self.create_tables(resource_classes)
+
+        loaded = {}
+        for resource_class in resource_classes:
+            name = resource_class.resource_name()
+            if name in ("contactTags", "contactLists"):
+                rows = self._fetch_memberships(resource_class, max_workers)
+            else:
+                rows = (
+                    row
+                    for page in resource_class.api().list_pages(
+                        name, max_workers=max_workers
+                    )
+                    for row in page[name]
+                )
+            loaded[name] = self._replace(resource_class, rows)
+        return loaded
+
+    def _fetch_memberships(
+        self,
+        resource_class: typing.Type,
+        max_workers: typing.Optional[int],
+    ) -> typing.Iterator[dict]:
+        """Fetch the rows of a nested resource for every replicated contact."""
+        from .resources import Contact
+
+        name = resource_class.resource_name()
+        contact_ids = [
+            row["id"] for row in self.connection.execute("SELECT id FROM contacts")
+        ]
+        # A page of contacts at a time, so memory stays bounded
+        for start in range(0, len(contact_ids), PAGE_CONTACTS):
+            chunk = contact_ids[start : start + PAGE_CONTACTS]
+            yield from Contact.related_rows(chunk, [name], max_workers)[name]
+
+    def _insert_sql(
+        self,
+        resource_class: typing.Type,
+        table: typing.Optional[str] = None,
+    ) -> str:
+        """Get the statement inserting or replacing a row.
+
+        Args:
+            resource_class: The resource class of the row.
+            table: The quoted table to insert into. Defaults to the one of
+                the resource class.
+        """
+        columns = ["id"] + self._columns(resource_class)
+        table = table or _quote(resource_class.resource_name())
+        return (
+            f"INSERT OR REPLACE INTO {table} "
+            f"({', '.join(_quote(column) for column in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+    def _values(self, resource_class: typing.Type, row: dict) -> tuple:
+        """Get the values of an API row, in column order."""
+        return (row.get("id"),) + tuple(
+            row.get(column) for column in self._columns(resource_class)
+        )
+
+    def _replace(self, resource_class: typing.Type, rows: typing.Iterable[dict]) -> int:
+        """Replace every row of a table.
+
+        The rows, which may take minutes to fetch, are first written to a
+        temporary table. Temporary tables are private to the connection and
+        do not lock the database, so upsert and apply_change are only held
+        up by the short transaction swapping the rows in. Changes applied
+        to the table in the meantime are replaced, so run an incremental
+        sync after a load.
+        """
+        table = _quote(resource_class.resource_name())
+        staging = f"temp.{_quote(resource_class.resource_name() + '_staging')}"
+        sql = self._insert_sql(resource_class, staging)
+        connection = self.connection
+
+        connection.execute(f"DROP TABLE IF EXISTS {staging}")
+        connection.execute(f"CREATE TABLE {staging} AS SELECT * FROM {table} WHERE 0")
+        count = 0
+        try:
+            connection.execute("BEGIN")
+            try:
+                for row in rows:
+                    connection.execute(sql, self._values(resource_class, row))
+                    count += 1
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+            with self._write_lock:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.execute(f"DELETE FROM {table}")
+                    connection.execute(
+                        f"INSERT OR REPLACE INTO {table} SELECT * FROM {staging}"
+                    )
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+        finally:
+            connection.execute(f"DROP TABLE IF EXISTS {staging}")
+        return count
+
+    def upsert(self, resources: typing.Iterable[typing.Any]) -> None:
+        """Insert or replace resources in the replica."""
+        with self._write_lock:
+            for resource in resources:
+                row = {"id": resource.id, **resource.serialize_data()}
+                self.connection.execute(
+                    self._insert_sql(type(resource)),
+                    self._values(type(resource), row),
+                )
+
+    def apply_change(self, change: typing.Any) -> None:
+        """Apply a change from IncrementalContactSync to the replica.
+
+        The contact is replaced, and so are its memberships when the change
+        carries them.
+        """
+        from .resources import ContactList, ContactTag
+
+        with self._write_lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for resource_class, members in (
+                    (ContactTag, change.contact_tags),
+                    (ContactList, change.contact_lists),
+                ):
+                    if members is None:
+                        continue
+                    connection.execute(
+                        f"DELETE FROM {_quote(resource_class.resource_name())} "
+                        "WHERE contact = ?",
+                        (change.contact.id,),
+                    )
+                    for member in members:
+                        row = {"id": member.id, **member.serialize_data()}
+                        connection.execute(
+                            self._insert_sql(resource_class),
+                            self._values(resource_class, row),
+                        )
+                contact = change.contact
+                connection.execute(
+                    self._insert_sql(type(contact)),
+                    self._values(
+                        type(contact), {"id": contact.id, **contact.serialize_data()}
+                    ),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def delete(self, resource: typing.Any) -> None:
+        """Remove a resource from the replica."""
+        with self._write_lock:
+            self.connection.execute(
+                f"DELETE FROM {_quote(resource.resource_name())} WHERE id = ?",
+                (resource.id,),
+            )
+
+    def has_table(self, resource_class: typing.Type) -> bool:
+        """Whether the resources of a class are replicated."""
+        row = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (resource_class.resource_name(),),
+        ).fetchone()
+        return row is not None
+
+    def filter_rows(
+        self,
+        resource_class: typing.Type,
+        filters: dict,
+        parent_resource_id: typing.Optional[int] = None,
+        parent_resource_name: typing.Optional[str] = None,
+    ) -> typing.List[dict]:
+        """Get the rows matching the filters, as the API would list them.
+
+        Filters on an API field are supported both as field and
+        filters[field]. search matches the search_field of the resource.
+
+        Returns:
+            The matching rows, ordered by id.
+        """
+        columns = self._columns(resource_class)
+        clauses = []
+        params: typing.List[typing.Any] = []
+
+        for key, value in filters.items():
+            if key == "search" and getattr(resource_class, "search_field", None):
+                clauses.append(f"{_quote(resource_class.search_field)} LIKE ?")
+                params.append(f"%{value}%")
+                continue
+
+            column = key[len("filters[") : -1] if key.startswith("filters[") else key
+            if column not in columns and column != "id":
+                raise ValueError(f"The replica does not support the {key} filter")
+            clauses.append(f"{_quote(column)} = ?")
+            params.append(value)
+
+        if parent_resource_id and parent_resource_name:
+            clauses.append(f"{_quote(singular_form(parent_resource_name))} = ?")
+            params.append(parent_resource_id)
+
+        sql = f"SELECT * FROM {_quote(resource_class.resource_name())}"
+        if clauses:
+            sql = f"{sql} WHERE {' AND '.join(clauses)}"
+        sql = f"{sql} ORDER BY CAST(id AS INTEGER)"
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def get_row(
+        self,
+        resource_class: typing.Type,
+        resource_id: typing.Optional[int],
+    ) -> typing.Optional[dict]:
+        """Get the row of the resource with the given id, if replicated."""
+        row = self.connection.execute(
+            f"SELECT * FROM {_quote(resource_class.resource_name())} WHERE id = ?",
+            (resource_id,),
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+
+_lock = threading.Lock()
+_replica: typing.Optional[Replica] = None
+
+
+def get_replica() -> Replica:
+    """Get the replica configured by MARKETING_CAMPAIGN_REPLICA_PATH.
+
+    Returns:
+        The replica shared by the whole process.
+    """
+    global _replica
+
+    if _replica is None:
+        path = getattr(settings, "MARKETING_CAMPAIGN_REPLICA_PATH", None)
+        if not path:
+            raise RuntimeError(
+                "MARKETING_CAMPAIGN_REPLICA_PATH django setting is not set properly"
+            )
+        with _lock:
+            if _replica is None:
+                _replica = Replica(path)
+    return _replica
+
+
+def set_replica(replica: typing.Optional[Replica]) -> None:
+    """Replace the shared replica, e.g. in tests."""
+    global _replica
+
+    with _lock:
+        _replica = replica
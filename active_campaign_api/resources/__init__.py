@@ -2,7 +2,7 @@
 
 from .contact_list import ContactList  # noqa: 401
 from .contact_tag import ContactTag  # noqa: 401
-from .contact import Contact  # noqa: 401
+from .contact import Contact, BulkImportResult  # noqa: 401
 from .custom_field import CustomField  # noqa: 401
 from .custom_field_value import CustomFieldValue  # noqa: 401
 from .marketing_list import MarketingList  # noqa: 401
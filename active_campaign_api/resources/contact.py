@@ -1,8 +1,37 @@
 """Contact resource for ActiveCampaign"""
 
+import time
 import typing
+import itertools
 from django.http import Http404
-from ..base_resource import Resource
+from ..base_resource import API, Resource
+from ..concurrency import map_concurrently
+
+
+class BulkImportResult:
+    """Outcome of Contact.bulk_create."""
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        # The batchId of every submitted chunk
+        self.batch_ids: typing.List[str] = []
+        # Batches that had not completed when polling stopped
+        self.pending: typing.List[str] = []
+        # Rows reported by the server as imported or failed
+        self.succeeded: typing.List = []
+        self.failed: typing.List = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every batch completed without failures."""
+        return not self.pending and not self.failed
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return (
+            f"<BulkImportResult succeeded={len(self.succeeded)} "
+            f"failed={len(self.failed)} pending={len(self.pending)}>"
+        )
 
 
 class Contact(Resource):
@@ -10,13 +39,19 @@ class Contact(Resource):
     An ActiveCampaign contact. Allows to:
      - Create a contact
      - Find a contact by email
+     - Create or update a contact by email
      - Update a contact
      - Delete a contact
+     - Create contacts in bulk
 
     Check docs in:
     https://developers.activecampaign.com/reference#contact
     """
 
+    __slots__ = ("email",)
+
+    supports_keyset = True
+
     def __init__(self, email: str, **kwargs: typing.Dict) -> None:
         """Initialize contact."""
         super().__init__(**kwargs)
@@ -38,9 +73,186 @@ class Contact(Resource):
             "email": "email",
         }
 
+    @staticmethod
+    def related_resources() -> typing.Dict[str, typing.Tuple[type, str]]:
+        """Map the related collections the API can embed in a response."""
+        # Imported here, as these resources import Contact
+        from .contact_list import ContactList
+        from .contact_tag import ContactTag
+        from .custom_field_value import CustomFieldValue
+
+        return {
+            "contactTags": (ContactTag, "contact"),
+            "contactLists": (ContactList, "contact"),
+            "fieldValues": (CustomFieldValue, "contact"),
+        }
+
+    @classmethod
+    def find(cls: typing.Type, email: str, source: str = API) -> "Contact":
+        """Find contact by email.
+
+        Args:
+            email: The email of the contact.
+            source: "replica" to read from the local replica instead of the API
+        """
+        for contact in cls.filter({"email": email}, source=source):
+            return contact
+        raise Http404
+
     @classmethod
-    def find(cls: typing.Type, email: str) -> "Contact":
+    async def afind(cls: typing.Type, email: str) -> "Contact":
         """Find contact by email."""
-        for contact in cls.filter({"email": email}):
+        async for contact in cls.afilter({"email": email}):
             return contact
         raise Http404
+
+    @classmethod
+    def sync(cls: typing.Type, email: str, **fields: typing.Any) -> "Contact":
+        """Create or update the contact with the given email.
+
+        Uses a single request to the sync endpoint, so two workers
+        syncing the same email cannot create it twice.
+
+        Args:
+            email: The email of the contact.
+            fields: Other API fields of the contact, e.g. firstName.
+
+        Returns:
+            The created or updated contact.
+        """
+        data = cls.api().sync_contact({**fields, "email": email})
+        return cls._from_api_data(data)
+
+    @classmethod
+    def ids_matching(
+        cls,
+        contact_ids: typing.Iterable[typing.Union[int, str]],
+        filters: dict,
+        max_workers: typing.Optional[int] = None,
+    ) -> typing.Set[str]:
+        """Get which of the given contacts match the filters.
+
+        Contacts are checked a page at a time with the ids filter, so
+        this costs one request per PAGE_LIMIT contacts.
+
+        Args:
+            contact_ids: The ids of the contacts to check.
+            filters: Query parameters of the contacts endpoint,
+                e.g. {"tagid": 3}.
+            max_workers: Threads used to check several pages at once.
+
+        Returns:
+            The ids of the matching contacts, as strings.
+        """
+        api = cls.api()
+        contact_ids = [str(contact_id) for contact_id in contact_ids]
+        chunks = [
+            contact_ids[start : start + api.PAGE_LIMIT]
+            for start in range(0, len(contact_ids), api.PAGE_LIMIT)
+        ]
+
+        def check(chunk: typing.List[str]) -> typing.List[str]:
+            return [
+                str(data["id"])
+                for data in api.list_resources(
+                    cls.resource_name(),
+                    query_params={**filters, "ids": ",".join(chunk)},
+                )
+            ]
+
+        matching = set()
+        for _, ids, error in map_concurrently(check, chunks, max_workers):
+            if error is not None:
+                raise error
+            matching.update(ids)
+        return matching
+
+    @classmethod
+    def bulk_create(
+        cls,
+        contacts: typing.Iterable[typing.Union["Contact", dict]],
+        tags: typing.Optional[typing.List[str]] = None,
+        list_ids: typing.Optional[typing.List[int]] = None,
+        chunk_size: typing.Optional[int] = None,
+        poll_interval: float = 5.0,
+        timeout: typing.Optional[float] = 600.0,
+    ) -> BulkImportResult:
+        """Create many contacts through the bulk import endpoint.
+
+        Contacts are streamed in chunks of at most chunk_size, each chunk
+        being a single request. The status of every chunk is then polled
+        until completed or until the timeout expires.
+
+        Args:
+            contacts: Contact instances, or dicts in the bulk import format
+                (email, first_name, tags, fields, subscribe, ...)
+            tags: Tag names to add to every contact.
+            list_ids: Ids of the lists to subscribe every contact to.
+            chunk_size: Contacts per request. Defaults to the API maximum.
+            poll_interval: Seconds between status checks.
+            timeout: Seconds to wait for the imports to complete. None to
+                return right after submitting them, without polling.
+
+        Returns:
+            The batch ids and per-row outcome of the import.
+        """
+        api = cls.api()
+        chunk_size = min(chunk_size or api.BULK_IMPORT_LIMIT, api.BULK_IMPORT_LIMIT)
+        result = BulkImportResult()
+
+        rows = (cls._to_bulk_row(contact, tags, list_ids) for contact in contacts)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            result.batch_ids.append(api.bulk_import(chunk)["batchId"])
+
+        if timeout is None:
+            result.pending = list(result.batch_ids)
+            return result
+
+        pending = list(result.batch_ids)
+        deadline = time.monotonic() + timeout
+        while pending:
+            for batch_id in list(pending):
+                status = api.bulk_import_status(batch_id)
+                if status.get("status") != "completed":
+                    continue
+                pending.remove(batch_id)
+                result.succeeded.extend(status.get("success") or [])
+                result.failed.extend(status.get("failure") or [])
+            if not pending or time.monotonic() + poll_interval > deadline:
+                break
+            time.sleep(poll_interval)
+
+        result.pending = pending
+        return result
+
+    @staticmethod
+    def _to_bulk_row(
+        contact: typing.Union["Contact", dict],
+        tags: typing.Optional[typing.List[str]],
+        list_ids: typing.Optional[typing.List[int]],
+    ) -> dict:
+        """Convert a contact to the bulk import format.
+
+        Args:
+            contact: A Contact, or a dict already in the bulk import format.
+            tags: Tag names to add to the contact.
+            list_ids: Ids of the lists to subscribe the contact to.
+
+        Returns:
+            The row to send to the bulk import endpoint.
+        """
+        if isinstance(contact, Contact):
+            row = {"email": contact.email}
+        else:
+            row = dict(contact)
+
+        if tags:
+            row["tags"] = list(row.get("tags", [])) + list(tags)
+        if list_ids:
+            row["subscribe"] = list(row.get("subscribe", [])) + [
+                {"listid": list_id} for list_id in list_ids
+            ]
+        return row
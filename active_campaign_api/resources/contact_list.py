@@ -1,7 +1,9 @@
 """ContactList resource for ActiveCampaign"""
 
 import typing
-from ..base_resource import Resource
+from ..base_resource import API, Resource
+from ..concurrency import BulkResult, map_concurrently
+from .contact import Contact
 
 
 class ContactList(Resource):
@@ -9,11 +11,15 @@ class ContactList(Resource):
     List contact pair in ActiveCampaign. Allows to:
      - Subscribe a contact to a list
      - Unsubscribe a contact from a list.
+     - Subscribe or unsubscribe many contacts at once.
 
     Check docs in:
     https://developers.activecampaign.com/reference#update-list-status-for-contact
     """
 
+    __slots__ = ("list_id", "contact_id", "status")
+    write_order = 1
+
     def __init__(
         self,
         list_id: typing.Optional[int],
@@ -24,8 +30,8 @@ class ContactList(Resource):
         """Initialize the contact list.
 
         Args:
-            list_id: The id of the list.
-            contact_id: The id of the contact.
+            list_id: The id of the list, or the MarketingList itself.
+            contact_id: The id of the contact, or the Contact itself.
             status: 1 to subscribe the contact and 2 to unsubscribe.
         """
         super().__init__(**kwargs)
@@ -52,7 +58,56 @@ class ContactList(Resource):
         }
 
     @classmethod
-    def all_in_contact(cls, contact_id: int):
+    def all_in_contact(cls, contact_id: int, source: str = API):
+        """Get all ContactLists associated to contact with that id"""
+        for contact_list in cls.get_all_in("contacts", contact_id, source=source):
+            yield contact_list
+
+    @classmethod
+    async def aall_in_contact(cls, contact_id: int):
         """Get all ContactLists associated to contact with that id"""
-        for contact_list in cls.get_all_in("contacts", contact_id):
+        async for contact_list in cls.aget_all_in("contacts", contact_id):
             yield contact_list
+
+    @classmethod
+    def bulk_set_status(
+        cls,
+        list_id: typing.Union[Resource, int],
+        contact_ids: typing.Iterable[typing.Union[int, str]],
+        status: int,
+        max_workers: typing.Optional[int] = None,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> BulkResult:
+        """Subscribe or unsubscribe many contacts to a list.
+
+        Contacts that already have the status on the list are skipped, the
+        others are updated concurrently within the rate limit of the client.
+
+        Args:
+            list_id: The id of the list, or the MarketingList itself.
+            contact_ids: The ids of the contacts to update.
+            status: 1 to subscribe the contacts and 2 to unsubscribe.
+            max_workers: Threads to use. Defaults to MARKETING_CAMPAIGN_MAX_WORKERS.
+            on_progress: Called with the number of processed and total
+                contacts after each contact.
+
+        Returns:
+            The outcome for every contact.
+        """
+        if isinstance(list_id, Resource):
+            list_id = list_id.id
+        contact_ids = list(contact_ids)
+        current = Contact.ids_matching(
+            contact_ids,
+            {"listid": list_id, "status": status},
+            max_workers,
+        )
+
+        def set_status(contact_id: typing.Union[int, str]) -> bool:
+            if str(contact_id) in current:
+                return False
+            return cls(list_id, contact_id, status).save()
+
+        return BulkResult().collect(
+            map_concurrently(set_status, contact_ids, max_workers, on_progress)
+        )
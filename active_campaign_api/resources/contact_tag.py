@@ -1,7 +1,10 @@
 """ContactTag resource for ActiveCampaign"""
 
 import typing
-from ..base_resource import Resource
+from ..base_resource import API, Resource
+from ..concurrency import BulkResult, map_concurrently
+from .contact import Contact
+from .tag import Tag
 
 
 class ContactTag(Resource):
@@ -9,11 +12,15 @@ class ContactTag(Resource):
     Tag for a contact in ActiveCampaign. Allows to:
      - Add a tag to contact
      - Remove a tag from a contact.
+     - Add or remove a tag from many contacts at once.
 
     Check docs in:
     https://developers.activecampaign.com/reference#contact-tags
     """
 
+    __slots__ = ("tag", "contact")
+    write_order = 1
+
     def __init__(
         self,
         tag: typing.Optional[int],
@@ -23,8 +30,8 @@ class ContactTag(Resource):
         """Initialize the contact tag.
 
         Args:
-            tag: The id of the tag.
-            contact: The id of the contact.
+            tag: The id of the tag, or the Tag itself.
+            contact: The id of the contact, or the Contact itself.
         """
         super().__init__(**kwargs)
         self.tag = tag
@@ -48,7 +55,100 @@ class ContactTag(Resource):
         }
 
     @classmethod
-    def all_in_contact(cls, contact_id: int):
+    def all_in_contact(cls, contact_id: int, source: str = API):
         """Get all ContactTags associated to contact with that id"""
-        for contact_tag in cls.get_all_in("contacts", contact_id):
+        for contact_tag in cls.get_all_in("contacts", contact_id, source=source):
             yield contact_tag
+
+    @classmethod
+    async def aall_in_contact(cls, contact_id: int):
+        """Get all ContactTags associated to contact with that id"""
+        async for contact_tag in cls.aget_all_in("contacts", contact_id):
+            yield contact_tag
+
+    @classmethod
+    def bulk_add(
+        cls,
+        tag: typing.Union[Tag, int, str],
+        contact_ids: typing.Iterable[typing.Union[int, str]],
+        max_workers: typing.Optional[int] = None,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> BulkResult:
+        """Add a tag to many contacts.
+
+        Contacts that already have the tag are skipped, the others are
+        tagged concurrently within the rate limit of the client.
+
+        Args:
+            tag: The Tag, its id, or its name as a string.
+            contact_ids: The ids of the contacts to tag.
+            max_workers: Threads to use. Defaults to MARKETING_CAMPAIGN_MAX_WORKERS.
+            on_progress: Called with the number of processed and total
+                contacts after each contact.
+
+        Returns:
+            The outcome for every contact.
+        """
+        tag_id = cls._tag_id(tag)
+        contact_ids = list(contact_ids)
+        tagged = Contact.ids_matching(contact_ids, {"tagid": tag_id}, max_workers)
+
+        def add(contact_id: typing.Union[int, str]) -> bool:
+            if str(contact_id) in tagged:
+                return False
+            return cls(tag=tag_id, contact=contact_id).save()
+
+        return BulkResult().collect(
+            map_concurrently(add, contact_ids, max_workers, on_progress)
+        )
+
+    @classmethod
+    def bulk_remove(
+        cls,
+        tag: typing.Union[Tag, int, str],
+        contact_ids: typing.Iterable[typing.Union[int, str]],
+        max_workers: typing.Optional[int] = None,
+        on_progress: typing.Optional[typing.Callable[[int, int], None]] = None,
+    ) -> BulkResult:
+        """Remove a tag from many contacts.
+
+        Contacts without the tag are skipped. The ContactTag of each of the
+        others is then looked up and deleted, concurrently within the rate
+        limit of the client.
+
+        Args:
+            tag: The Tag, its id, or its name as a string.
+            contact_ids: The ids of the contacts to untag.
+            max_workers: Threads to use. Defaults to MARKETING_CAMPAIGN_MAX_WORKERS.
+            on_progress: Called with the number of processed and total
+                contacts after each contact.
+
+        Returns:
+            The outcome for every contact.
+        """
+        tag_id = str(cls._tag_id(tag))
+        contact_ids = list(contact_ids)
+        tagged = Contact.ids_matching(contact_ids, {"tagid": tag_id}, max_workers)
+
+        def remove(contact_id: typing.Union[int, str]) -> bool:
+            if str(contact_id) not in tagged:
+                return False
+            removed = False
+            for contact_tag in cls.all_in_contact(contact_id):
+                if str(contact_tag.tag) == tag_id:
+                    contact_tag.delete()
+                    removed = True
+            return removed
+
+        return BulkResult().collect(
+            map_concurrently(remove, contact_ids, max_workers, on_progress)
+        )
+
+    @staticmethod
+    def _tag_id(tag: typing.Union[Tag, int, str]) -> typing.Union[int, str]:
+        """Get the id of a tag given as a Tag, an id or a name."""
+        if isinstance(tag, Tag):
+            return tag.id
+        if isinstance(tag, str):
+            return Tag.find(tag).id
+        return tag
@@ -1,17 +1,207 @@
 """CustomField resource for Active Campaign """
 
+import time
 import typing
+import threading
+from django.conf import settings
 from django.http import Http404
 from ..base_resource import Resource
+from ..lookup_cache import CachedLookupMixin
 
 
-class CustomField(Resource):
+class CustomFieldCatalogue:
+    """Index of every CustomField by title and by id.
+
+    The whole list of fields is loaded at once, shared with other processes
+    through the lookup cache, and kept in memory for ttl seconds. Fields
+    saved or deleted through this library are updated in place, and a title
+    that is not indexed triggers at most one reload per min_refresh_interval,
+    so fields created elsewhere are picked up without a scan per lookup.
+    """
+
+    def __init__(
+        self,
+        resource_class: typing.Type["CustomField"],
+        ttl: float = 300.0,
+        min_refresh_interval: float = 30.0,
+    ) -> None:
+        """Initialize an empty catalogue.
+
+        Args:
+            resource_class: The resource class of the indexed fields.
+            ttl: Seconds before the catalogue is reloaded.
+            min_refresh_interval: Minimum seconds between two reloads
+                caused by a missing title.
+        """
+        self.resource_class = resource_class
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+
+        self._lock = threading.Lock()
+        self._by_title: typing.Dict[str, dict] = {}
+        self._by_id: typing.Dict[str, dict] = {}
+        self._loaded_at: typing.Optional[float] = None
+
+    def is_stale(self) -> bool:
+        """Whether the catalogue was never loaded or has expired."""
+        return (
+            self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+        )
+
+    def may_refresh_on_miss(self) -> bool:
+        """Whether a missing title may trigger a reload now."""
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.min_refresh_interval
+        )
+
+    def _cached_rows(self) -> typing.Tuple[typing.Optional[list], typing.Any, str]:
+        """Get the rows shared through the lookup cache, if any.
+
+        Returns:
+            The cached rows or None, the cache and the key to store them at.
+        """
+        cache = self.resource_class._lookup_cache()
+        key = self.resource_class._lookup_key("catalogue", "all")
+        return cache.get(key), cache, key
+
+    async def _acached_rows(
+        self,
+    ) -> typing.Tuple[typing.Optional[list], typing.Any, str]:
+        """Get the rows shared through the lookup cache, if any.
+
+        Async counterpart of _cached_rows.
+        """
+        cache = self.resource_class._lookup_cache()
+        key = await self.resource_class._alookup_key("catalogue", "all")
+        return await cache.aget(key), cache, key
+
+    def _store_rows(
+        self,
+        rows: typing.List[dict],
+        cache: typing.Any,
+        key: str,
+    ) -> None:
+        """Share the loaded rows and rebuild the indexes from them."""
+        ttl = getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300)
+        if ttl:
+            cache.set(key, rows, ttl)
+        self.load(rows)
+
+    def refresh(self) -> None:
+        """Reload every field."""
+        rows, cache, key = self._cached_rows()
+        if rows is None:
+            rows = [
+                {"id": field.id, **field.serialize_data()}
+                for field in self.resource_class.all()
+            ]
+        self._store_rows(rows, cache, key)
+
+    async def arefresh(self) -> None:
+        """Reload every field.
+
+        Async counterpart of refresh.
+        """
+        rows, cache, key = await self._acached_rows()
+        if rows is None:
+            rows = [
+                {"id": field.id, **field.serialize_data()}
+                async for field in self.resource_class.aall()
+            ]
+        ttl = getattr(settings, "MARKETING_CAMPAIGN_LOOKUP_CACHE_TTL", 300)
+        if ttl:
+            await cache.aset(key, rows, ttl)
+        self.load(rows)
+
+    def load(self, rows: typing.Iterable[dict]) -> None:
+        """Replace the indexes with the given API rows."""
+        by_title = {}
+        by_id = {}
+        for row in rows:
+            # Keep the first field of a duplicated title, as a scan would
+            by_title.setdefault(row["title"], row)
+            by_id[str(row["id"])] = row
+
+        with self._lock:
+            self._by_title = by_title
+            self._by_id = by_id
+            self._loaded_at = time.monotonic()
+
+    def update(self, field: "CustomField") -> None:
+        """Index a field that was saved."""
+        row = {"id": field.id, **field.serialize_data()}
+        with self._lock:
+            previous = self._by_id.get(str(field.id))
+            if previous and self._by_title.get(previous["title"]) is previous:
+                del self._by_title[previous["title"]]
+            self._by_id[str(field.id)] = row
+            self._by_title.setdefault(row["title"], row)
+
+    def discard(self, field: "CustomField") -> None:
+        """Remove a field that was deleted from the indexes."""
+        with self._lock:
+            row = self._by_id.pop(str(field.id), None)
+            if row is not None and self._by_title.get(row["title"]) is row:
+                del self._by_title[row["title"]]
+
+    def get(self, title: str) -> typing.Optional[dict]:
+        """Get the row of the field with the given title, if loaded."""
+        return self._by_title.get(title)
+
+    def get_by_id(self, field_id: typing.Union[int, str]) -> typing.Optional[dict]:
+        """Get the row of the field with the given id, if loaded."""
+        return self._by_id.get(str(field_id))
+
+    def lookup(self, title: str) -> typing.Optional[dict]:
+        """Get the row of the field with the given title, loading if needed."""
+        if self.is_stale():
+            self.refresh()
+        row = self.get(title)
+        if row is None and self.may_refresh_on_miss():
+            self.refresh()
+            row = self.get(title)
+        return row
+
+    def lookup_many(self, titles: typing.Iterable[str]) -> typing.Dict[str, dict]:
+        """Get the rows of the fields with the given titles, loading if needed.
+
+        Returns:
+            The rows found, by title.
+        """
+        titles = list(titles)
+        if self.is_stale():
+            self.refresh()
+        if any(self.get(title) is None for title in titles):
+            if self.may_refresh_on_miss():
+                self.refresh()
+        return {
+            title: self.get(title) for title in titles if self.get(title) is not None
+        }
+
+    async def alookup(self, title: str) -> typing.Optional[dict]:
+        """Get the row of the field with the given title, loading if needed.
+
+        Async counterpart of lookup.
+        """
+        if self.is_stale():
+            await self.arefresh()
+        row = self.get(title)
+        if row is None and self.may_refresh_on_miss():
+            await self.arefresh()
+            row = self.get(title)
+        return row
+
+
+class CustomField(CachedLookupMixin, Resource):
     """An ActiveCampaign CustomField. Allows to:
     - Create a CustomField
-    - Find a CustomField by the title
+    - Find CustomFields by the title
     - Delete a CustomField
     """
 
+    __slots__ = ("title", "type")
+
     def __init__(
         self,
         title: str,
@@ -45,6 +235,16 @@ class CustomField(Resource):
             "type": "type",
         }
 
+    # Shared by every CustomField lookup of the process
+    _catalogue: typing.Optional[CustomFieldCatalogue] = None
+
+    @classmethod
+    def catalogue(cls) -> CustomFieldCatalogue:
+        """Get the index of every CustomField."""
+        if cls._catalogue is None:
+            cls._catalogue = CustomFieldCatalogue(cls)
+        return cls._catalogue
+
     @classmethod
     def find(cls, field_title: str) -> "CustomField":
         """Get the CustomField with the given title.
@@ -56,10 +256,62 @@ class CustomField(Resource):
         Returns:
             The CustomField with the given titles.
         """
-        for custom_field in cls.all():
-            if custom_field.title == field_title:
-                return custom_field
-        raise Http404
+        row = cls.catalogue().lookup(field_title)
+        if row is None:
+            raise Http404
+        return cls._from_api_data(row)
+
+    @classmethod
+    def find_many(
+        cls,
+        field_titles: typing.Iterable[str],
+    ) -> typing.Dict[str, "CustomField"]:
+        """Get the CustomFields with the given titles.
+
+        Args:
+            field_titles: The titles of the CustomFields to find
+
+        Returns:
+            The CustomFields found, by title. Titles without a
+            CustomField are left out.
+        """
+        rows = cls.catalogue().lookup_many(field_titles)
+        return {title: cls._from_api_data(row) for title, row in rows.items()}
+
+    @classmethod
+    async def afind(cls, field_title: str) -> "CustomField":
+        """Get the CustomField with the given title.
+
+        Async counterpart of find.
+        """
+        row = await cls.catalogue().alookup(field_title)
+        if row is None:
+            raise Http404
+        return cls._from_api_data(row)
+
+    def save(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Save the CustomField and update the catalogue."""
+        written = super().save(*args, **kwargs)
+        if written:
+            self.catalogue().update(self)
+        return written
+
+    def delete(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Delete the CustomField and remove it from the catalogue."""
+        self.catalogue().discard(self)
+        return super().delete(*args, **kwargs)
+
+    async def asave(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Save the CustomField and update the catalogue."""
+        written = await super().asave(*args, **kwargs)
+        if written:
+            self.catalogue().update(self)
+        return written
+
+    async def adelete(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Delete the CustomField and remove it from the catalogue."""
+        self.catalogue().discard(self)
+        return await super().adelete(*args, **kwargs)
 
     def __repr__(self) -> str:
         """Generate internal representation."""
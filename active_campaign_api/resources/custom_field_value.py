@@ -11,11 +11,14 @@ class CustomFieldValue(Resource):
     - Delete a CustomFieldValue
     """
 
+    __slots__ = ("contact_id", "field_id", "value")
+    write_order = 1
+
     def __init__(
         self,
         contact_id: str,
-        custom_field_id: str,
-        value,
+        custom_field_id: typing.Optional[str] = None,
+        value=None,
         **kwargs: typing.Dict,
     ) -> None:
         """Initialize the CustomFieldValue.
@@ -31,9 +34,11 @@ class CustomFieldValue(Resource):
                 Value for the field that you're updating. For multi-select options
                 this needs to be in the format of ||option1||option2||
         """
+        # Rows loaded from the API pass the attribute name instead
+        field_id = kwargs.pop("field_id", None)
         super().__init__(**kwargs)
         self.contact_id = contact_id
-        self.field_id = custom_field_id
+        self.field_id = custom_field_id if custom_field_id is not None else field_id
         self.value = value
 
     @staticmethod
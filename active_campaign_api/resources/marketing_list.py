@@ -2,12 +2,15 @@
 
 import typing
 from django.http import Http404
-from ..base_resource import Resource
+from ..base_resource import API, REPLICA, Resource
+from ..lookup_cache import CachedLookupMixin
 
 
-class MarketingList(Resource):
+class MarketingList(CachedLookupMixin, Resource):
     """An ActiveCampaign contact list."""
 
+    __slots__ = ("name", "stringid", "sender_url", "sender_reminder")
+
     def __init__(
         self,
         name: str,
@@ -50,18 +53,39 @@ class MarketingList(Resource):
         }
 
     @classmethod
-    def find(cls: typing.Type, name: str) -> "MarketingList":
+    def find(cls: typing.Type, name: str, source: str = API) -> "MarketingList":
         """Get the list with the given name.
 
         Args:
             name: The name of the list to find
+            source: "replica" to read from the local replica instead of the API
 
         Returns:
             The list with the given name.
         """
-        for lst in cls.filter({"filters[name]": name}):
-            return lst
-        raise Http404
+
+        def load() -> "MarketingList":
+            for lst in cls.filter({"filters[name]": name}, source=source):
+                return lst
+            raise Http404
+
+        if cls._check_source(source) == REPLICA:
+            return load()
+        return cls.cached_lookup("name", name, load)
+
+    @classmethod
+    async def afind(cls: typing.Type, name: str) -> "MarketingList":
+        """Get the list with the given name.
+
+        Async counterpart of find.
+        """
+
+        async def load() -> "MarketingList":
+            async for lst in cls.afilter({"filters[name]": name}):
+                return lst
+            raise Http404
+
+        return await cls.acached_lookup("name", name, load)
 
     def __repr__(self) -> str:
         """Generate internal representation."""
@@ -2,10 +2,11 @@
 
 import typing
 from django.http import Http404
-from ..base_resource import Resource
+from ..base_resource import API, REPLICA, Resource
+from ..lookup_cache import CachedLookupMixin
 
 
-class Tag(Resource):
+class Tag(CachedLookupMixin, Resource):
     """A tag in ActiveCampaign. Allows to:
     - Create a tag
     - Find a tag by name
@@ -16,6 +17,11 @@ class Tag(Resource):
     https://developers.activecampaign.com/reference#tags
     """
 
+    __slots__ = ("tag", "tag_type", "description")
+
+    # The field the search filter matches in the replica
+    search_field = "tag"
+
     def __init__(
         self,
         tag: str,
@@ -49,18 +55,39 @@ class Tag(Resource):
         }
 
     @classmethod
-    def find(cls: typing.Type, tag_name: str) -> "Tag":
+    def find(cls: typing.Type, tag_name: str, source: str = API) -> "Tag":
         """Get the first tag with the given name.
 
         Args:
             tag: The name of the tag to find
+            source: "replica" to read from the local replica instead of the API
 
         Returns:
             The tag with the given name.
         """
-        for tag in cls.filter({"search": tag_name}):
-            return tag
-        raise Http404
+
+        def load() -> "Tag":
+            for tag in cls.filter({"search": tag_name}, source=source):
+                return tag
+            raise Http404
+
+        if cls._check_source(source) == REPLICA:
+            return load()
+        return cls.cached_lookup("tag", tag_name, load)
+
+    @classmethod
+    async def afind(cls: typing.Type, tag_name: str) -> "Tag":
+        """Get the first tag with the given name.
+
+        Async counterpart of find.
+        """
+
+        async def load() -> "Tag":
+            async for tag in cls.afilter({"search": tag_name}):
+                return tag
+            raise Http404
+
+        return await cls.acached_lookup("tag", tag_name, load)
 
     def __repr__(self) -> str:
         """Generate internal representation."""
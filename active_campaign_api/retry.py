@@ -0,0 +1,179 @@
+"""Retry policy and circuit breaker for API requests"""
+
+import time
+import random
+import typing
+import threading
+import email.utils
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Backoff is exponential with full jitter, unless the server sent a
+    Retry-After header, which is honored up to max_backoff.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        methods: typing.Optional[typing.Iterable[str]] = None,
+        statuses: typing.Optional[typing.Iterable[int]] = None,
+    ) -> None:
+        """Initialize the retry policy.
+
+        Args:
+            max_retries: Retries allowed after the first attempt.
+            backoff_factor: Delay, in seconds, before the first retry.
+            max_backoff: Upper bound of the delay, including the one
+                asked for by Retry-After.
+            jitter: Whether to randomize the delay between 0 and its value.
+            methods: HTTP methods that may be retried. Defaults to
+                the idempotent ones, an empty list retries none.
+            statuses: Response statuses that are retried.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.methods = frozenset(
+            self.IDEMPOTENT_METHODS if methods is None else methods
+        )
+        self.statuses = frozenset(
+            self.RETRY_STATUSES if statuses is None else statuses
+        )
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        status: typing.Optional[int] = None,
+        retry_after: typing.Optional[str] = None,
+    ) -> typing.Optional[float]:
+        """Get the delay before retrying a failed attempt.
+
+        Args:
+            method: The HTTP method of the request.
+            attempt: The number of the failed attempt, starting at 0.
+            status: The response status, None if the connection failed.
+            retry_after: The Retry-After header of the response, if any.
+
+        Returns:
+            The seconds to wait, or None if the request must not be retried.
+        """
+        if attempt >= self.max_retries or method not in self.methods:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+
+        delay = self._parse_retry_after(retry_after)
+        if delay is not None:
+            # Do not let the server park a worker for an unbounded time
+            return min(self.max_backoff, delay)
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(retry_after: typing.Optional[str]) -> typing.Optional[float]:
+        """Convert a Retry-After header, in seconds or as a date, to seconds."""
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, date.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Fail fast while the API server is down.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are refused for recovery_timeout seconds. Then a single trial
+    request is let through: its success closes the circuit, its failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds to refuse requests once open.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Get the current state of the circuit."""
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # A trial that never reported back does not block forever
+            now = time.monotonic()
+            if (
+                self._trial_in_flight
+                and now - self._trial_started_at < self.recovery_timeout
+            ):
+                return False
+            self._trial_in_flight = True
+            self._trial_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        """Record a request the server answered properly."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a request that failed because of the server."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
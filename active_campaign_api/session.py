@@ -0,0 +1,229 @@
+"""Unit of work batching resource writes"""
+
+import typing
+
+from .base_resource import Resource
+from .concurrency import map_concurrently
+
+SAVE = "save"
+DELETE = "delete"
+
+
+def _payload_value(value: typing.Any) -> typing.Hashable:
+    """Get a hashable form of an attribute value, to compare payloads."""
+    if isinstance(value, Resource):
+        if value.id is None:
+            # Unsaved resources are only equal to themselves
+            return ("unsaved", id(value))
+        return str(value.id)
+    if isinstance(value, int) and not isinstance(value, bool):
+        # The API sends ids as strings
+        return str(value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class SessionResult:
+    """Outcome of ActiveCampaignSession.flush."""
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        self.saved: typing.List[Resource] = []
+        self.deleted: typing.List[Resource] = []
+        # Resources that had nothing to save, including new resources
+        # identical to one that was created
+        self.unchanged: typing.List[Resource] = []
+        # (operation, resource, error) of every failed write
+        self.errors: typing.List[typing.Tuple[str, Resource, BaseException]] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every write succeeded."""
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise ActiveCampaignSession.Error if any write failed."""
+        if self.errors:
+            raise ActiveCampaignSession.Error(self)
+
+    def __repr__(self) -> str:
+        """Generate internal representation."""
+        return (
+            f"<SessionResult saved={len(self.saved)} deleted={len(self.deleted)} "
+            f"unchanged={len(self.unchanged)} errors={len(self.errors)}>"
+        )
+
+
+class ActiveCampaignSession:
+    """Collect resource writes and send them together.
+
+    Usage:
+        with ActiveCampaignSession() as session:
+            session.save(contact)
+            session.save(ContactTag(tag, contact))
+        session.result.raise_for_errors()
+
+    Writes are flushed when the block exits without an exception. Writing
+    the same resource twice is sent once, and so are new resources with the
+    same fields, e.g. two ContactTag(tag=1, contact=5): the copies get the id
+    of the one created. Deleting a resource that was never created cancels
+    its creation. Resources are saved by ascending
+    write_order, so a Contact is created before the ContactTag referencing
+    it, and deleted in the opposite order. Writes of the same order are sent
+    concurrently, within the rate limit of the client.
+    """
+
+    class Error(Exception):
+        """Some writes of a flush failed."""
+
+        def __init__(self, result: SessionResult) -> None:
+            """Initialize the error from the result of the flush."""
+            super().__init__(f"{len(result.errors)} writes failed")
+            self.result = result
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        """Initialize an empty session.
+
+        Args:
+            max_workers: Threads used to send writes of the same order.
+                Defaults to MARKETING_CAMPAIGN_MAX_WORKERS.
+        """
+        self.max_workers = max_workers
+        # Pending operation by resource identity, in insertion order
+        self._operations: typing.Dict[int, typing.Tuple[str, Resource]] = {}
+        self.result: typing.Optional[SessionResult] = None
+
+    def __enter__(self) -> "ActiveCampaignSession":
+        """Start collecting writes."""
+        return self
+
+    def __exit__(self, exc_type: typing.Any, *args: typing.Any) -> None:
+        """Flush the writes, unless the block raised."""
+        if exc_type is None:
+            self.flush()
+        else:
+            self._operations.clear()
+
+    def save(self, resource: Resource) -> None:
+        """Create or update the resource on flush."""
+        self._operations[id(resource)] = (SAVE, resource)
+
+    def delete(self, resource: Resource) -> None:
+        """Delete the resource on flush."""
+        key = id(resource)
+        if not resource._created:
+            # Never created: deleting only cancels a pending creation
+            self._operations.pop(key, None)
+            return
+        self._operations[key] = (DELETE, resource)
+
+    def __len__(self) -> int:
+        """Get the number of pending writes."""
+        return len(self._operations)
+
+    def flush(self) -> SessionResult:
+        """Send every pending write.
+
+        Returns:
+            The outcome of every write, also stored in self.result.
+        """
+        operations = list(self._operations.values())
+        self._operations.clear()
+        result = SessionResult()
+
+        saves = [resource for operation, resource in operations if operation == SAVE]
+        deletes = [
+            resource for operation, resource in operations if operation == DELETE
+        ]
+
+        for resources in self._by_write_order(saves):
+            # Deduplicated per order, once the ids of dependencies are known
+            resources, copies = self._dedupe(resources)
+            for resource, written, error in map_concurrently(
+                self._save, resources, self.max_workers
+            ):
+                resource_copies = copies.get(id(resource), ())
+                if error is not None:
+                    result.errors.append((SAVE, resource, error))
+                    result.errors.extend(
+                        (SAVE, copy, error) for copy in resource_copies
+                    )
+                    continue
+                if written:
+                    result.saved.append(resource)
+                else:
+                    result.unchanged.append(resource)
+                for copy in resource_copies:
+                    copy._id = resource._id
+                    copy._created = resource._created
+                    copy._loaded = resource._loaded and dict(resource._loaded)
+                    result.unchanged.append(copy)
+
+        for resources in reversed(self._by_write_order(deletes)):
+            for resource, _, error in map_concurrently(
+                self._delete, resources, self.max_workers
+            ):
+                if error is not None:
+                    result.errors.append((DELETE, resource, error))
+                else:
+                    result.deleted.append(resource)
+
+        self.result = result
+        return result
+
+    @staticmethod
+    def _by_write_order(
+        resources: typing.List[Resource],
+    ) -> typing.List[typing.List[Resource]]:
+        """Group resources by ascending write_order."""
+        groups: typing.Dict[int, typing.List[Resource]] = {}
+        for resource in resources:
+            groups.setdefault(resource.write_order, []).append(resource)
+        return [groups[order] for order in sorted(groups)]
+
+    @staticmethod
+    def _dedupe(
+        resources: typing.List[Resource],
+    ) -> typing.Tuple[typing.List[Resource], typing.Dict[int, typing.List[Resource]]]:
+        """Drop new resources with the same type and fields as an earlier one.
+
+        Returns:
+            The resources to save, and the dropped copies by identity of
+            the resource saved in their place.
+        """
+        kept = []
+        first_by_key: typing.Dict[typing.Hashable, Resource] = {}
+        copies: typing.Dict[int, typing.List[Resource]] = {}
+        for resource in resources:
+            if resource._created:
+                kept.append(resource)
+                continue
+            key = (
+                type(resource),
+                tuple(
+                    (fieldname, _payload_value(getattr(resource, attribute)))
+                    for fieldname, attribute in resource._field_maps()[2]
+                ),
+            )
+            first = first_by_key.setdefault(key, resource)
+            if first is resource:
+                kept.append(resource)
+            else:
+                copies.setdefault(id(first), []).append(resource)
+        return kept, copies
+
+    @staticmethod
+    def _save(resource: Resource) -> bool:
+        """Save a resource whose dependencies were saved first."""
+        for dependency in resource.dependencies():
+            if dependency.id is None:
+                raise ValueError(f"{resource!r} depends on unsaved {dependency!r}")
+        return resource.save()
+
+    @staticmethod
+    def _delete(resource: Resource) -> None:
+        """Delete a resource."""
+        resource.delete()
@@ -0,0 +1,82 @@
+"""Compare the throughput of the JSON codecs on a page of contacts.
+
+Usage:
+    python benchmarks/codec_bench.py [--number 2000]
+"""
+
+import sys
+import timeit
+import argparse
+
+from active_campaign_api.codec import JSONCodec, OrjsonCodec, orjson
+
+
+def contacts_page(size: int = 100) -> dict:
+    """Build a page of contacts shaped like the API's list response."""
+    contacts = []
+    for index in range(1, size + 1):
+        contacts.append(
+            {
+                "cdate": "2021-03-04T10:11:12-06:00",
+                "email": f"contact{index}@example.com",
+                "phone": "+1 555 0100",
+                "firstName": "Jane",
+                "lastName": f"Doe {index}",
+                "orgid": "0",
+                "orgname": "",
+                "segmentio_id": "",
+                "bounced_hard": "0",
+                "bounced_soft": "0",
+                "ip": "127.0.0.1",
+                "hash": "5c0b3e0f9c1a2d3e4f5a6b7c8d9e0f1a",
+                "deleted": "0",
+                "anonymized": "0",
+                "adate": None,
+                "udate": "2021-03-05T08:00:00-06:00",
+                "edate": None,
+                "links": {
+                    "contactLists": f"/api/3/contacts/{index}/contactLists",
+                    "contactTags": f"/api/3/contacts/{index}/contactTags",
+                    "fieldValues": f"/api/3/contacts/{index}/fieldValues",
+                    "notes": f"/api/3/contacts/{index}/notes",
+                },
+                "id": str(index),
+                "organization": None,
+            }
+        )
+    return {"scoreValues": [], "contacts": contacts, "meta": {"total": "25000"}}
+
+
+def main() -> None:
+    """Time encoding and decoding a page with every available codec."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Pages per run")
+    args = parser.parse_args()
+
+    codecs = [JSONCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    else:
+        print("orjson is not installed, only timing json", file=sys.stderr)
+
+    page = contacts_page()
+    body = JSONCodec.dumps(page)
+    print(f"Page of {len(page['contacts'])} contacts, {len(body) / 1024:.1f} KiB")
+    print(
+        f"{'codec':<8} {'loads pages/s':>14} {'dumps pages/s':>14} "
+        f"{'loads MiB/s':>12}"
+    )
+
+    for codec in codecs:
+        # Best of 5 runs, to reduce the noise of other processes
+        loads = min(timeit.repeat(lambda: codec.loads(body), number=args.number))
+        dumps = min(timeit.repeat(lambda: codec.dumps(page), number=args.number))
+        print(
+            f"{codec.name:<8} {args.number / loads:>14.0f} "
+            f"{args.number / dumps:>14.0f} "
+            f"{args.number * len(body) / loads / 2 ** 20:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare the memory held by lazy views and full resources of many contacts.
+
+Usage:
+    python benchmarks/resource_memory_bench.py [--rows 100000]
+"""
+
+import gc
+import argparse
+import tracemalloc
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from active_campaign_api import Contact, ResourceView  # noqa: E402
+from codec_bench import contacts_page  # noqa: E402
+
+
+def measure(build) -> tuple:
+    """Get the memory allocated and kept by build, and its peak, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current, peak
+
+
+def main() -> None:
+    """Measure building every kind of object from the same rows."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    # The rows are shared, only the objects built over them are measured
+    rows = contacts_page(args.rows)["contacts"]
+    results = {
+        "views": measure(lambda: [ResourceView(Contact, row) for row in rows]),
+        "resources": measure(lambda: Contact.from_api_rows(rows)),
+    }
+
+    print(f"{args.rows} contacts")
+    print(f"{'kind':<10} {'kept MiB':>9} {'peak MiB':>9} {'bytes/row':>10}")
+    for kind, (current, peak) in results.items():
+        print(
+            f"{kind:<10} {current / 2 ** 20:>9.1f} {peak / 2 ** 20:>9.1f} "
+            f"{current / args.rows:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Django settings and fixtures shared by the tests"""
+
+import pytest
+import django
+from django.conf import settings
+
+settings.configure(
+    MARKETING_CAMPAIGN_KEY="test-key",
+    MARKETING_CAMPAIGN_URL="https://selfhacked.api-us1.com/api/3",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+django.setup()
+
+from active_campaign_api import ActiveCampaignAPI, get_client  # noqa: E402
+from active_campaign_api.active_campaign_mock import (  # noqa: E402,401
+    mock_active_campaign,
+)
+
+ROOT_URL = "https://selfhacked.api-us1.com/api/3"
+
+
+@pytest.fixture()
+def client(mock_active_campaign) -> ActiveCampaignAPI:  # noqa
+    """Get the client installed by mock_active_campaign, with its mocks."""
+    mock_active_campaign()
+    return get_client()
@@ -0,0 +1,30 @@
+"""Tagging many contacts at once"""
+
+from active_campaign_api import ContactTag
+from .conftest import ROOT_URL
+
+
+def test_bulk_add_skips_tagged_contacts(client, requests_mock):
+    # Of the given contacts, only contact 2 already has the tag
+    check = requests_mock.get(
+        f"{ROOT_URL}/contacts",
+        json={"contacts": [{"id": "2"}], "meta": {"total": "1"}},
+    )
+
+    result = ContactTag.bulk_add(7, [1, 2, 3], max_workers=2)
+
+    assert result.changed == [1, 3]
+    assert result.skipped == [2]
+    assert result.ok
+    assert check.call_count == 1
+    assert check.last_request.qs["tagid"] == ["7"]
+    assert check.last_request.qs["ids"] == ["1,2,3"]
+    created = [
+        request.json()["contactTag"]
+        for request in requests_mock.request_history
+        if request.method == "POST"
+    ]
+    assert sorted(created, key=lambda data: data["contact"]) == [
+        {"tag": 7, "contact": 1},
+        {"tag": 7, "contact": 3},
+    ]
@@ -0,0 +1,81 @@
+"""Resumable export of every resource of a type"""
+
+import json
+
+import pytest
+import requests
+
+from active_campaign_api import Contact, FileCheckpointStore
+from active_campaign_api.export import NDJSONWriter, ResourceExporter
+from .conftest import ROOT_URL
+
+TOTAL = 7
+
+
+def test_export_resumes_after_interrupted_checkpoint(client, requests_mock, tmp_path):
+    client.PAGE_LIMIT = 2
+    client.retry_policy = None
+    failing = {"after": 6}
+
+    def list_contacts(request, context) -> dict:
+        after = int(request.qs.get("id_greater", ["0"])[0])
+        if after == failing["after"]:
+            context.status_code = 500
+            return {}
+        ids = range(after + 1, min(after + 2, TOTAL) + 1)
+        return {
+            "contacts": [{"id": str(i), "email": f"{i}@example.com"} for i in ids],
+            "meta": {"total": str(TOTAL)},
+        }
+
+    requests_mock.get(f"{ROOT_URL}/contacts", json=list_contacts)
+    output = tmp_path / "contacts.ndjson"
+
+    def exporter() -> ResourceExporter:
+        return ResourceExporter(
+            Contact,
+            NDJSONWriter(str(output)),
+            FileCheckpointStore(str(tmp_path / "checkpoint.json")),
+            checkpoint_every=2,
+        )
+
+    # Fails on the fourth page, after a checkpoint at the second one and a
+    # third page written past it
+    with pytest.raises(requests.HTTPError):
+        exporter().run()
+    checkpoint = exporter().checkpoint()
+    assert checkpoint["rows"] == 4
+    assert checkpoint["position"] == {"after_id": "4"}
+
+    failing["after"] = None
+    assert exporter().run() == TOTAL
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["id"] for row in rows] == [str(i) for i in range(1, TOTAL + 1)]
+    assert exporter().checkpoint() is None
+
+
+def test_export_starts_over_when_output_is_missing(client, requests_mock, tmp_path):
+    client.PAGE_LIMIT = 2
+    requests_mock.get(
+        f"{ROOT_URL}/contacts",
+        json={"contacts": [{"id": "1", "email": "1@example.com"}]},
+    )
+    store = FileCheckpointStore(str(tmp_path / "checkpoint.json"))
+    store.save(
+        "export:contacts",
+        json.dumps(
+            {
+                "position": {"after_id": "1"},
+                "rows": 1,
+                "writer": {"size": 10},
+                "complete": False,
+            }
+        ),
+    )
+    exporter = ResourceExporter(
+        Contact, NDJSONWriter(str(tmp_path / "contacts.ndjson")), store
+    )
+
+    assert exporter.checkpoint() is None
+    assert exporter.run() == 1
@@ -0,0 +1,49 @@
+"""Keyset pagination of contacts"""
+
+import pytest
+
+from active_campaign_api import Contact
+from .conftest import ROOT_URL
+
+TOTAL = 5
+
+
+def list_contacts(request, context) -> dict:
+    """List the contacts after id_greater, PAGE_LIMIT at a time."""
+    after = int(request.qs.get("id_greater", ["0"])[0])
+    limit = int(request.qs["limit"][0])
+    ids = range(after + 1, min(after + limit, TOTAL) + 1)
+    return {
+        "contacts": [{"id": str(i), "email": f"{i}@example.com"} for i in ids],
+        "meta": {"total": str(TOTAL)},
+    }
+
+
+def test_keyset_pages_continue_after_last_id(client, requests_mock):
+    client.PAGE_LIMIT = 2
+    matcher = requests_mock.get(f"{ROOT_URL}/contacts", json=list_contacts)
+
+    emails = [contact.email for contact in Contact.all(keyset=True)]
+
+    assert emails == [f"{i}@example.com" for i in range(1, TOTAL + 1)]
+    history = matcher.request_history
+    assert [request.qs.get("id_greater") for request in history] == [
+        None,
+        ["2"],
+        ["4"],
+    ]
+    assert not any("offset" in request.qs for request in history)
+
+
+def test_keyset_scan_resumes_after_id(client, requests_mock):
+    client.PAGE_LIMIT = 2
+    requests_mock.get(f"{ROOT_URL}/contacts", json=list_contacts)
+
+    ids = [contact.id for contact in Contact.all(keyset=True, after_id=3)]
+
+    assert ids == ["4", "5"]
+
+
+def test_keyset_rejects_concurrent_pages(client):
+    with pytest.raises(ValueError):
+        list(Contact.all(keyset=True, max_workers=4))
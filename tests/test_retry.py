@@ -0,0 +1,82 @@
+"""Retries and circuit breaker of the API client"""
+
+import pytest
+import requests
+
+from active_campaign_api import CircuitBreaker, Contact, RetryPolicy
+from active_campaign_api.base_api import BaseAPI
+from .conftest import ROOT_URL
+
+CONTACT = {"contact": {"id": "1", "email": "jane@example.com"}}
+
+
+def test_get_is_retried_after_server_error(client, requests_mock):
+    client.retry_policy = RetryPolicy(max_retries=2, backoff_factor=0, jitter=False)
+    matcher = requests_mock.get(
+        f"{ROOT_URL}/contacts/1",
+        [{"status_code": 503}, {"json": CONTACT, "status_code": 200}],
+    )
+
+    contact = Contact.get(1)
+
+    assert contact.email == "jane@example.com"
+    assert matcher.call_count == 2
+
+
+def test_retry_after_is_honored(client, requests_mock, monkeypatch):
+    client.retry_policy = RetryPolicy(max_retries=1, max_backoff=5)
+    sleeps = []
+    monkeypatch.setattr("active_campaign_api.base_api.time.sleep", sleeps.append)
+    requests_mock.get(
+        f"{ROOT_URL}/contacts/1",
+        [
+            {"status_code": 429, "headers": {"Retry-After": "60"}},
+            {"json": CONTACT, "status_code": 200},
+        ],
+    )
+
+    Contact.get(1)
+
+    # Clamped to max_backoff
+    assert sleeps == [5]
+
+
+def test_post_is_not_retried(client, requests_mock):
+    client.retry_policy = RetryPolicy(max_retries=2, backoff_factor=0, jitter=False)
+    matcher = requests_mock.post(f"{ROOT_URL}/contacts", status_code=503)
+
+    with pytest.raises(requests.HTTPError):
+        Contact("jane@example.com").save()
+
+    assert matcher.call_count == 1
+
+
+def test_circuit_opens_after_repeated_failures(client, requests_mock):
+    client.retry_policy = None
+    client.circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    matcher = requests_mock.get(f"{ROOT_URL}/contacts/1", status_code=500)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            Contact.get(1)
+    with pytest.raises(BaseAPI.CircuitOpenError):
+        Contact.get(1)
+
+    assert client.circuit_breaker.state == CircuitBreaker.OPEN
+    assert matcher.call_count == 2
+
+
+def test_circuit_closes_after_successful_trial(client, requests_mock):
+    client.retry_policy = None
+    client.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    requests_mock.get(
+        f"{ROOT_URL}/contacts/1",
+        [{"status_code": 500}, {"json": CONTACT, "status_code": 200}],
+    )
+
+    with pytest.raises(requests.HTTPError):
+        Contact.get(1)
+    assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    assert Contact.get(1).email == "jane@example.com"
+    assert client.circuit_breaker.state == CircuitBreaker.CLOSED